@@ -1 +1,11 @@
-from .rym import *
\ No newline at end of file
+from .rym import *
+from .batch import *
+from .serialization import *
+from .metrics import *
+from .profiling import *
+from .transport import set_session, configure_session, enable_cache, disable_cache, configure_rate_limit, set_root_url
+from .parsing import set_parser, set_fast_extraction
+from .ratelimiter import TokenBucket, limiter
+from .cache import ResponseCache
+from .store import SQLiteStore, enable_store, disable_store
+from .crawler import Crawler
@@ -1,27 +1,311 @@
-import requests
-import bs4
+import asyncio
+import hashlib
 import re
-from ratelimit import limits, sleep_and_retry
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import attrgetter
+from . import parsing
+from . import transport
+from .metrics import stats
+from . import profiling
 from .exceptions import *
 from .global_variables import *
 
-class EntryCollection:
-    @sleep_and_retry
-    @limits(calls=CALL_LIMIT, period=RATE_LIMIT)
-    def __init__(self, url, pages_class) -> None:
+_compact = False
+
+def set_compact(enabled=True):
+    # compact entities run every extractor right after loading and then drop
+    # the parse trees and the response, see Entity._load
+    global _compact
+    _compact = enabled
+
+_store = None
+
+def set_store(store):
+    # a store set here is asked for an entity before it is requested, see
+    # rympy.store.SQLiteStore
+    global _store
+    _store = store
+
+def get_store():
+    return _store
+
+# set while a field is being extracted, so that fields read by other fields are
+# counted once, as part of the outer one
+_extracting = threading.local()
+
+def check_response(response, failure="Initial request failed"):
+    if response.status_code == 503:
+        raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
+    if response.status_code != 200:
+        raise RequestFailed(f"{failure} with status code {response.status_code}.")
+
+def _field_state(value, _seen=None):
+    # a comparable snapshot of an extracted value. Simple objects are compared by
+    # their public attributes, entities by URL, and objects met again (tracks and
+    # their credits) by the order they were first met in
+    _seen = {} if _seen is None else _seen
+    if isinstance(value, (list, tuple)):
+        return tuple(_field_state(item, _seen) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _field_state(item, _seen)) for key, item in value.items())
+    if isinstance(value, Entity):
+        return (type(value).__name__, value.url)
+    if hasattr(value, "__dict__") or hasattr(type(value), "__slots__"):
+        if id(value) in _seen:
+            return ("seen", _seen[id(value)])
+        _seen[id(value)] = len(_seen)
+        if hasattr(value, "__dict__"):
+            attributes = vars(value).items()
+        else:
+            attributes = [(name, getattr(value, name)) for klass in type(value).__mro__
+                          for name in getattr(klass, "__slots__", ()) if hasattr(value, name)]
+        return (type(value).__name__, tuple((name, _field_state(item, _seen)) for name, item in attributes
+                                            if not name.startswith("_")))
+    return value
+
+class LazyField:
+    # runs the extractor on first access and stores the result on the instance,
+    # which then shadows this descriptor. Entities are shared between threads (see
+    # rympy.identity), so the first evaluation holds a lock of the instance and a
+    # thread that waited on it gets the value stored by the other one
+    def __init__(self, extractor) -> None:
+        self.extractor = extractor
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        # reentrant, extractors read other fields of the same instance
+        with instance.__dict__.setdefault("_field_lock", threading.RLock()):
+            if self.name in instance.__dict__:
+                return instance.__dict__[self.name]
+            return self._evaluate(instance)
+
+    def _evaluate(self, instance):
+        extractor = getattr(instance, self.extractor)
+        if profiling.profiling_enabled():
+            extractor = partial(profiling.profile_call, instance, self.extractor, extractor)
+        if getattr(_extracting, "active", False):
+            value = extractor()
+        else:
+            _extracting.active = True
+            start = time.perf_counter()
+            try:
+                value = extractor()
+            finally:
+                _extracting.active = False
+                stats.observe("extract", type(instance).__qualname__, time.perf_counter() - start, field=self.name)
+        instance.__dict__[self.name] = value
+        return value
+
+class Entity:
+    _kind = None
+    _eager = False
+    # classes with selectolax extractors, the only ones a Lexbor tree is built for
+    _fast_extractors = False
+    _compact = None
+    # private attributes that to_dict keeps alongside the public ones
+    _serialized_private = ("_etag", "_last_modified", "_content_hash")
+
+    @classmethod
+    async def afetch(cls, *args, eager=False, compact=None, fields=(), **kwargs):
+        # fields are extracted in the worker thread that parses the page. Reading any
+        # other field afterwards runs its extractor, and the request of properties
+        # like Label.chart, on the calling thread: from a coroutine use aread
+        entity = cls.__new__(cls)
+        entity._eager = eager
+        entity._compact = compact
+        entity._prepare(*args, **kwargs)
+        await entity._afetch(fields)
+        return entity
+
+    async def aread(self, *names):
+        # reads fields and properties off the event loop; one value for one name,
+        # a tuple for several, like operator.attrgetter
+        return await asyncio.to_thread(attrgetter(*names), self)
+
+    @classmethod
+    def _lazy_fields(cls):
+        fields = dict()
+        for klass in reversed(cls.__mro__):
+            fields.update((name, None) for name, value in vars(klass).items() if isinstance(value, LazyField))
+        return list(fields)
+
+    def _evaluate_fields(self):
+        for name in self._lazy_fields():
+            getattr(self, name)
+
+    def _extract(self):
+        pass
+
+    def _fetch(self):
+        if self._load_stored():
+            return
+        self._load(transport.get(self.url, kind=self._kind, entity=type(self).__qualname__))
+
+    async def _afetch(self, fields=()):
+        if self._load_stored():
+            if fields:
+                await self.aread(*fields)
+            return
+        response = await transport.aget(self.url, kind=self._kind, entity=type(self).__qualname__)
+        # parsing and extraction are CPU bound, keep them off the event loop
+        await asyncio.to_thread(self._load, response, fields)
+
+    def _load_stored(self):
+        if _store is not None and _store.load_into(self):
+            stats.count("store_hits", type(self).__qualname__)
+            return True
+        return False
+
+    def refresh(self):
+        # re-reads the page only if it changed since it was loaded and returns the
+        # names of the already extracted fields whose values changed. Fields that
+        # were never read are simply extracted from the new page when they are
+        if (response := self._changed_page(self.url)) is None:
+            return list()
+        evaluated = [name for name in self._lazy_fields() if name in self.__dict__ and not name.startswith("_")]
+        old_values = {name: _field_state(self.__dict__[name]) for name in evaluated}
+        for name in self._lazy_fields():
+            self.__dict__.pop(name, None)
+
+        self._parse(response)
+        if self._eager or self._is_compact():
+            self._evaluate_fields()
+        changed = [name for name in evaluated if _field_state(getattr(self, name)) != old_values[name]]
+        if self._is_compact():
+            self._release_page()
+        return changed
+
+    def _changed_page(self, url):
+        # conditional request on the validators of the last load, with a hash of the
+        # body as fallback for when the server sends neither
+        headers = dict()
+        if etag := getattr(self, "_etag", None):
+            headers["If-None-Match"] = etag
+        if last_modified := getattr(self, "_last_modified", None):
+            headers["If-Modified-Since"] = last_modified
+        response = transport.get(url, kind=self._kind, fresh=True, headers=headers, entity=type(self).__qualname__)
+        if response.status_code == 304:
+            return None
+        check_response(response, "Refresh request failed")
+        if hashlib.sha1(response.content).hexdigest() == getattr(self, "_content_hash", None):
+            self._remember_validators(response)
+            return None
+        return response
+
+    def _remember_validators(self, response):
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        self._content_hash = hashlib.sha1(response.content).hexdigest()
+
+    @property
+    def _soup(self):
+        # with fast extraction the soup is only built once an extractor without a
+        # selectolax version asks for it
+        if (soup := self.__dict__.get("_page_soup")) is None and (content := self.__dict__.get("_unparsed_page")) is not None:
+            with stats.timer("parse", type(self).__qualname__):
+                soup = parsing.make_soup(content)
+            self._soup = soup
+        return soup
+
+    @_soup.setter
+    def _soup(self, soup):
+        self._page_soup = soup
+        self._unparsed_page = None
+
+    def _set_page(self, response):
+        self._cached_rym_response = response
+        with stats.timer("parse", type(self).__qualname__):
+            if self._fast_extractors and parsing.fast_extraction_enabled():
+                self._tree = parsing.make_tree(response.content)
+                self._soup = None
+                self._unparsed_page = response.content
+            else:
+                self._soup = parsing.make_soup(response.content)
+                self._tree = None
+
+    def _parse(self, response):
+        self._set_page(response)
+        self._remember_validators(response)
+
+    def _load(self, response, fields=()):
+        check_response(response)
+        self._parse(response)
+        with stats.timer("extract", type(self).__qualname__):
+            if profiling.profiling_enabled():
+                profiling.profile_call(self, "_extract", self._extract)
+            else:
+                self._extract()
+        if self._eager or self._is_compact():
+            self._evaluate_fields()
+        for name in fields:
+            getattr(self, name)
+        if self._is_compact():
+            self._release_page()
+
+    def _is_compact(self):
+        return _compact if self._compact is None else self._compact
+
+    def _release_page(self):
+        self._cached_rym_response = None
+        self._soup = None
+        self._tree = None
+
+class EntryCollection(Entity):
+    _kind = "collection"
+    _pages_class = None
+
+    def __init__(self, url, pages_class=None, compact=None) -> None:
+        self._compact = compact
+        if pages_class:
+            self._pages_class = pages_class
+        self._prepare(url)
+        self._fetch()
+
+    def _prepare(self, url):
+        self.url = url
         self.init_url = url
         self.current_url = url
-        self._cached_rym_response = requests.get(self.init_url, headers= HEADERS)
-        if self._cached_rym_response.status_code != 200:
-            raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}.")
-        self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
+
+    def _extract(self):
         self.current_page = 1
-        self.max_page = self._fetch_max_page(pages_class)
+        self.max_page = self._fetch_max_page(self._pages_class)
         if self.current_page > self.max_page:
             raise NoContent("This collection has no entries.")
         self.entries = [self._fetch_entries(init=True)]
 
+    def refresh(self):
+        # a changed first page resets the collection to that page, later pages are
+        # loaded again on demand. Fields read from the old first page (a list's
+        # author...) are extracted again like those of other entities
+        if (response := self._changed_page(self.init_url)) is None:
+            return list()
+        evaluated = [name for name in self._lazy_fields() if name in self.__dict__ and not name.startswith("_")]
+        old_values = {"max_page": self.max_page, "entries": _field_state(self.entries[0]),
+                      **{name: _field_state(self.__dict__[name]) for name in evaluated}}
+        for name in self._lazy_fields():
+            self.__dict__.pop(name, None)
+
+        self._parse(response)
+        self.current_url = self.init_url
+        self._extract()
+        if self._eager or self._is_compact():
+            self._evaluate_fields()
+        new_values = {"max_page": self.max_page, "entries": _field_state(self.entries[0]),
+                      **{name: _field_state(getattr(self, name)) for name in evaluated}}
+        if self._is_compact():
+            self._release_page()
+        return [name for name, value in new_values.items() if value != old_values[name]]
+
     def _fetch_max_page(self, pages_class):
+        if self._tree is not None:
+            return parsing.fast_max_page(self._tree, pages_class)
         try:
             return int(self._soup.find_all(class_=pages_class)[-1].text)
         except IndexError:
@@ -29,23 +313,104 @@ class EntryCollection:
         
     def load_more_entries(self):
         self.current_page += 1
-        self.current_url = re.sub(r"\d+\/$", f"{self.current_page}/", self.current_url)
+        self.current_url = self._page_url(self.current_page)
         self.entries.append(self._fetch_entries())
         return self
+
+    async def aload_more_entries(self):
+        if self.current_page >= self.max_page:
+            raise NoContent("No more pages to be loaded.")
+        page_url = self._page_url(self.current_page + 1)
+        response = await transport.aget(page_url, kind=self._kind, entity=type(self).__qualname__)
+        self.current_page += 1
+        self.current_url = page_url
+        self.entries.append(await asyncio.to_thread(self._load_page, response))
+        return self
+
+    async def apages(self):
+        for entries in list(self.entries):
+            yield entries
+        while self.current_page < self.max_page:
+            await self.aload_more_entries()
+            yield self.entries[-1]
+
+    def iter_entries(self):
+        # entries of every page in order, loading pages as they are reached. The
+        # page after the one being consumed is requested in a background thread,
+        # which still goes through the shared rate limiter
+        executor = ThreadPoolExecutor(max_workers=1)
+        prefetched = None
+        try:
+            page = 0
+            while page < len(self.entries) or self.current_page < self.max_page:
+                if page == len(self.entries):
+                    next_page = self.current_page + 1
+                    if prefetched and prefetched[0] == next_page:
+                        response = prefetched[1].result()
+                    else:
+                        response = self._get_page(next_page)
+                    prefetched = None
+                    self._add_page(next_page, response)
+                if page == len(self.entries) - 1 and self.current_page < self.max_page and not prefetched:
+                    next_page = self.current_page + 1
+                    prefetched = (next_page, executor.submit(self._get_page, next_page))
+                yield from self.entries[page]
+                page += 1
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __iter__(self):
+        return self.iter_entries()
+
+    def load_pages(self, pages, workers=4):
+        # pages are requested concurrently and parsed in page order; every page up to
+        # the highest one asked for is loaded so that entries stays one list per page
+        pages = list(pages)
+        if not pages:
+            return self
+        if max(pages) > self.max_page:
+            raise NoContent(f"This collection only has {self.max_page} pages.")
+        pages = range(self.current_page + 1, max(pages) + 1)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            for page, response in zip(pages, executor.map(self._get_page, pages)):
+                self._add_page(page, response)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return self
+
+    def _get_page(self, page):
+        return transport.get(self._page_url(page), kind=self._kind, entity=type(self).__qualname__)
+
+    def _add_page(self, page, response):
+        entries = self._load_page(response)
+        self.current_page = page
+        self.current_url = self._page_url(page)
+        self.entries.append(entries)
+
+    def _page_url(self, page):
+        return re.sub(r"\d+\/$", f"{page}/", self.current_url)
     
     def _fetch_entries(self, init=False):
         if self.current_page > self.max_page:
             raise NoContent("No more pages to be loaded.")
         
         if not init:
-            self._cached_rym_response = requests.get(self.current_url, headers= HEADERS)
-            if self._cached_rym_response.status_code != 200:
-                raise RequestFailed(f"Loading next page failed with status code {self._cached_rym_response.status_code}.")
-            self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
+            return self._load_page(transport.get(self.current_url, kind=self._kind, entity=type(self).__qualname__))
         
         return self._specific_fetch()
 
+    def _load_page(self, response):
+        check_response(response, "Loading next page failed")
+        self._set_page(response)
+        with stats.timer("extract", type(self).__qualname__):
+            entries = self._specific_fetch()
+        if self._is_compact():
+            self._release_page()
+        return entries
+
 class SimpleEntity:
+    __slots__ = ("title", "url")
     def __init__(self, *, name=None, title=None, username=None, url=None) -> None:
         self.title = name or title or username
         self.url = url
@@ -0,0 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .rym import *
+
+class BatchResult:
+    def __init__(self, *, item, entity=None, error=None) -> None:
+        self.item = item
+        self.entity = entity
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return f"BatchResult: {self.item!r} -> {self.error if self.error else self.entity!r}"
+
+def hydrate(item):
+    if isinstance(item, str):
+        return get_entity(item)
+    for method in ("get_release", "get_release_issue", "get_artist", "get_genre", "get_label", "get_user", "get_distributor"):
+        if hasattr(item, method):
+            return getattr(item, method)()
+    raise TypeError(f"Can't hydrate an object of type {type(item).__name__}.")
+
+def fetch_many(items, *, max_workers=4):
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(hydrate, item): item for item in items}
+        for future in as_completed(futures):
+            try:
+                yield BatchResult(item=futures[future], entity=future.result())
+            except Exception as exception:
+                yield BatchResult(item=futures[future], error=exception)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
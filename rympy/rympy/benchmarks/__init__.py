@@ -0,0 +1,4 @@
+from .fixtures import *
+from .runner import *
+from .server import *
+from .loadtest import *
@@ -0,0 +1,75 @@
+import argparse
+import json
+import sys
+from .fixtures import *
+from .runner import *
+from .server import *
+
+def main(argv=None):
+    argument_parser = argparse.ArgumentParser(prog="python -m rympy.benchmarks")
+    commands = argument_parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time every extractor over the saved pages")
+    run_parser.add_argument("--corpus", default=CORPUS_PATH)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--parser")
+    run_parser.add_argument("--fast", action="store_true", help="use the selectolax extractors")
+    run_parser.add_argument("--output", help="write the results as JSON, to be used as a baseline later")
+    run_parser.add_argument("--baseline", help="JSON results of an earlier run on the same machine to compare against")
+    run_parser.add_argument("--threshold", type=float, default=0.1, help="slowdown reported as a regression")
+
+    save_parser = commands.add_parser("save", help="download a real page into the corpus")
+    save_parser.add_argument("class_name", help="rympy class parsing the page, e.g. Release or Release.Reviews")
+    save_parser.add_argument("url")
+    save_parser.add_argument("--corpus", default=CORPUS_PATH)
+
+    serve_parser = commands.add_parser("serve", help="serve the saved pages as a local stand-in for the site")
+    serve_parser.add_argument("--corpus", default=CORPUS_PATH)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--latency", type=float, nargs="+", default=[0], help="seconds, or a min and max")
+    serve_parser.add_argument("--throttle", type=float, nargs=2, metavar=("CALLS", "PERIOD"), help="answer 503 past this rate")
+    serve_parser.add_argument("--error-rate", type=float, default=0, help="share of requests answered with 503")
+    serve_parser.add_argument("--slow-body", type=int, help="bytes per second")
+    serve_parser.add_argument("--pages", type=int, default=1, help="pages served for every collection")
+
+    arguments = argument_parser.parse_args(argv)
+
+    if arguments.command == "serve":
+        latency = arguments.latency[0] if len(arguments.latency) == 1 else tuple(arguments.latency[:2])
+        server = StandInServer(Corpus(arguments.corpus), host=arguments.host, port=arguments.port, latency=latency,
+                               throttle=arguments.throttle, error_rate=arguments.error_rate,
+                               slow_body=arguments.slow_body, pages=arguments.pages)
+        print(f"Serving {len(server.pages)} pages on {server.url}")
+        try:
+            server.start()._thread.join()
+        except KeyboardInterrupt:
+            server.stop()
+        return 0
+
+    if arguments.command == "save":
+        print(save_page(arguments.class_name, arguments.url, Corpus(arguments.corpus)))
+        return 0
+
+    corpus = Corpus(arguments.corpus)
+    if not corpus.pages:
+        print(f"No pages in {arguments.corpus}, add some with the save command.", file=sys.stderr)
+        return 1
+    results = run_benchmarks(corpus, repeat=arguments.repeat, parser=arguments.parser, fast_extraction=arguments.fast)
+    comparison = None
+    # timings only compare between runs on one machine, so there is no default baseline
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if (baseline["parser"], baseline["fast_extraction"]) != (results["parser"], results["fast_extraction"]):
+            print(f"The baseline was run with parser {baseline['parser']}"
+                  f"{', fast extraction' if baseline['fast_extraction'] else ''}.", file=sys.stderr)
+        comparison = compare(results, baseline, arguments.threshold)
+    print(format_report(results, comparison))
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    return 1 if comparison and comparison[1] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
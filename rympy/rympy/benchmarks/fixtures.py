@@ -0,0 +1,63 @@
+import json
+import os
+from ..cache import build_response
+from ..transport import canonical_url
+from .. import transport
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "corpus", "v1")
+
+class Corpus:
+    # a directory of saved pages and a manifest.json listing them:
+    # {"version": 1, "pages": [{"class": "Release", "url": ..., "file": "release/ok-computer.html"}]}
+    # class is the rympy class that parses the page, nested ones as "Release.Reviews".
+    # Pages written by hand in the markup of the site rather than saved from it are
+    # marked "synthetic": true; the shipped corpus is all synthetic
+    def __init__(self, path=CORPUS_PATH) -> None:
+        self.path = path
+        manifest_path = os.path.join(path, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as file:
+                manifest = json.load(file)
+        else:
+            manifest = {"version": 1, "pages": []}
+        self.version = manifest["version"]
+        self.pages = manifest["pages"]
+
+    def content(self, page):
+        with open(os.path.join(self.path, page["file"]), "rb") as file:
+            return file.read()
+
+    def add(self, class_name, url, content, file_name):
+        # stores a page that was fetched for real, see save_page
+        os.makedirs(os.path.dirname(os.path.join(self.path, file_name)) or self.path, exist_ok=True)
+        with open(os.path.join(self.path, file_name), "wb") as file:
+            file.write(content)
+        self.pages = [page for page in self.pages if canonical_url(page["url"]) != canonical_url(url)]
+        self.pages.append({"class": class_name, "url": url, "file": file_name})
+        self.save()
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, "manifest.json"), "w", encoding="utf-8") as file:
+            json.dump({"version": self.version, "pages": self.pages}, file, indent=2)
+
+class FixtureSession:
+    # stands in for the requests session and answers from the corpus, so the
+    # benchmarks never touch the network
+    def __init__(self, corpus) -> None:
+        self._pages = {canonical_url(page["url"]): corpus.content(page) for page in corpus.pages}
+
+    def get(self, url, **kwargs):
+        if (content := self._pages.get(canonical_url(url))) is None:
+            return build_response(url, 404, {}, "utf-8", b"")
+        return build_response(url, 200, {"Content-Type": "text/html; charset=utf-8"}, "utf-8", content)
+
+def save_page(class_name, url, corpus=None, file_name=None):
+    # downloads a real page into the corpus, through the normal rate limited transport
+    corpus = corpus or Corpus()
+    response = transport.get(url)
+    if response.status_code != 200:
+        raise ValueError(f"Saving {url} failed with status code {response.status_code}.")
+    file_name = file_name or class_name.lower().replace(".", "_") + "/" + canonical_url(url).split("://", 1)[1].strip("/").replace("/", "_") + ".html"
+    corpus.add(class_name, url, response.content, file_name)
+    return file_name
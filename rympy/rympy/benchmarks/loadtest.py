@@ -0,0 +1,56 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .. import transport
+
+def load_test(urls, *, workers=8, use_async=False, kind=None):
+    # requests every URL through the normal client path (rate limiter, cache, session)
+    # and reports throughput and latency percentiles. With a kind the responses can
+    # come from the cache, those are counted apart and left out of both
+    urls = list(urls)
+    start = time.perf_counter()
+    if use_async:
+        timings = asyncio.run(_async_timings(urls, workers, kind))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            timings = list(executor.map(lambda url: _timed_get(url, kind), urls))
+    seconds = time.perf_counter() - start
+
+    requested = [(latency, status) for latency, status, cached in timings if not cached]
+    latencies = sorted(latency for latency, _ in requested)
+    statuses = dict()
+    for _, status in requested:
+        statuses[status] = statuses.get(status, 0) + 1
+    return {"requests": len(requested),
+            "cache_hits": len(timings) - len(requested),
+            "seconds": seconds,
+            "requests_per_second": len(requested) / seconds if seconds else None,
+            "statuses": statuses,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": latencies[-1] if latencies else None}
+
+def _timed_get(url, kind):
+    start = time.perf_counter()
+    response = transport.get(url, kind=kind)
+    return time.perf_counter() - start, response.status_code, getattr(response, "from_cache", False)
+
+async def _async_timings(urls, workers, kind):
+    semaphore = asyncio.Semaphore(workers)
+
+    async def timed_get(url):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await transport.aget(url, kind=kind)
+            return time.perf_counter() - start, response.status_code, getattr(response, "from_cache", False)
+
+    try:
+        return await asyncio.gather(*(timed_get(url) for url in urls))
+    finally:
+        await transport.close_async_session()
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    return values[min(len(values) - 1, round(percent / 100 * (len(values) - 1)))]
@@ -0,0 +1,145 @@
+import time
+from contextlib import contextmanager
+from .. import base_classes
+from .. import parsing
+from .. import profiling
+from .. import rym
+from .. import transport
+from ..ratelimiter import TokenBucket
+from .fixtures import *
+
+def run_benchmarks(corpus=None, *, repeat=3, parser=None, fast_extraction=False):
+    # loads every corpus page repeat times and then reads each of its lazy fields,
+    # timing the load (request, parse, _extract) and every _fetch_* separately.
+    # Extractors are profiled while the fields are read and report self time, so a
+    # field that reads another one (_info, _issue_info...) is not charged for it
+    corpus = corpus or Corpus()
+    results = {"corpus_version": corpus.version,
+               "synthetic_pages": sum(bool(page.get("synthetic")) for page in corpus.pages),
+               "parser": parser or parsing.get_parser(),
+               "fast_extraction": fast_extraction,
+               "repeat": repeat,
+               "classes": dict(),
+               "extractors": dict(),
+               "errors": dict()}
+
+    with offline(corpus, parser, fast_extraction):
+        for _ in range(repeat):
+            for page in corpus.pages:
+                class_stats = results["classes"].setdefault(page["class"], {"pages": 0, "load_seconds": 0.0, "extract_seconds": 0.0})
+                start = time.perf_counter()
+                entity = load_entity(page["class"], page["url"])
+                class_stats["load_seconds"] += time.perf_counter() - start
+                class_stats["pages"] += 1
+
+                entity.__dict__.pop("_profile", None)
+                start = time.perf_counter()
+                with _profiling():
+                    for name in entity._lazy_fields():
+                        try:
+                            getattr(entity, name)
+                        except Exception as exception:
+                            results["errors"][f"{page['class']}.{getattr(type(entity), name).extractor}"] = repr(exception)
+                class_stats["extract_seconds"] += time.perf_counter() - start
+                for node in entity.__dict__.pop("_profile", ()):
+                    _add_self_time(results["extractors"], node)
+
+    for class_stats in results["classes"].values():
+        seconds = class_stats["load_seconds"] + class_stats["extract_seconds"]
+        class_stats["pages_per_second"] = class_stats["pages"] / seconds if seconds else None
+    return results
+
+def compare(results, baseline, threshold=0.1):
+    # seconds per page for the load and the extract phase, and per extractor call,
+    # against the baseline; returns (name, baseline seconds, seconds, ratio) rows
+    # and the ones slower than threshold
+    rows = list()
+    for name, stats in results["classes"].items():
+        if base_stats := baseline["classes"].get(name):
+            for phase in ("load", "extract"):
+                rows.append((f"{name} {phase}", base_stats[f"{phase}_seconds"] / base_stats["pages"],
+                             stats[f"{phase}_seconds"] / stats["pages"]))
+    for name, stats in results["extractors"].items():
+        if base_stats := baseline["extractors"].get(name):
+            rows.append((name, base_stats["seconds"] / base_stats["calls"], stats["seconds"] / stats["calls"]))
+    rows = [(name, before, after, after / before if before else None) for name, before, after in rows]
+    regressions = [row for row in rows if row[3] is not None and row[3] > 1 + threshold]
+    return rows, regressions
+
+def format_report(results, comparison=None):
+    synthetic = f" ({results['synthetic_pages']} synthetic pages)" if results.get("synthetic_pages") else ""
+    lines = [f"corpus v{results['corpus_version']}{synthetic}, parser {results['parser']}"
+             f"{', fast extraction' if results['fast_extraction'] else ''}, {results['repeat']} runs", ""]
+    # load is the request and parse of the page plus _extract, extract is reading every field
+    lines.append(f"{'class':<28}{'pages':>8}{'load ms':>12}{'extract ms':>12}{'total ms':>12}{'pages/s':>12}")
+    for name, stats in sorted(results["classes"].items()):
+        lines.append(f"{name:<28}{stats['pages']:>8}{stats['load_seconds'] / stats['pages'] * 1000:>12.2f}"
+                     f"{stats['extract_seconds'] / stats['pages'] * 1000:>12.2f}{_per_page(stats) * 1000:>12.2f}"
+                     f"{stats['pages_per_second'] or 0:>12.1f}")
+    lines += ["", f"{'extractor':<52}{'calls':>8}{'self ms/call':>14}{'total ms/call':>15}"]
+    for name, stats in sorted(results["extractors"].items(), key=lambda item: -item[1]["seconds"]):
+        lines.append(f"{name:<52}{stats['calls']:>8}{stats['seconds'] / stats['calls'] * 1000:>14.3f}"
+                     f"{stats.get('inclusive_seconds', stats['seconds']) / stats['calls'] * 1000:>15.3f}")
+    if results["errors"]:
+        lines += ["", "errors"] + [f"  {name}: {error}" for name, error in sorted(results["errors"].items())]
+    if comparison:
+        rows, regressions = comparison
+        lines += ["", f"{'against baseline':<52}{'before ms':>12}{'after ms':>12}{'ratio':>8}"]
+        for name, before, after, ratio in rows:
+            flag = "  slower" if (name, before, after, ratio) in regressions else ""
+            lines.append(f"{name:<52}{before * 1000:>12.3f}{after * 1000:>12.3f}{ratio or 0:>8.2f}{flag}")
+    return "\n".join(lines)
+
+def _per_page(stats):
+    return (stats["load_seconds"] + stats["extract_seconds"]) / stats["pages"]
+
+def _add_self_time(extractors, node):
+    stats = extractors.setdefault(f"{node.owner}.{node.name}", {"calls": 0, "seconds": 0.0, "inclusive_seconds": 0.0})
+    stats["calls"] += 1
+    stats["seconds"] += node.self_seconds
+    stats["inclusive_seconds"] += node.seconds
+    for child in node.children:
+        _add_self_time(extractors, child)
+
+def load_entity(class_name, url):
+    # builds the entity a corpus page is listed for, e.g. load_entity("Release.Reviews", url)
+    cls = rym
+    for name in class_name.split("."):
+        cls = getattr(cls, name)
+    if cls is rym.Chart:
+        return cls.from_url(url)
+    if issubclass(cls, base_classes.EntryCollection) or cls in (rym.Release, rym.ReleaseIssue, rym.Label, rym.Distributor):
+        return cls(url)
+    return cls(url=url)
+
+@contextmanager
+def _profiling():
+    enabled = profiling.profiling_enabled()
+    profiling.set_profiling(True)
+    try:
+        yield
+    finally:
+        profiling.set_profiling(enabled)
+
+@contextmanager
+def offline(corpus=None, parser=None, fast_extraction=False):
+    # the corpus stands in for the network, with no rate limit, cache or store
+    corpus = corpus or Corpus()
+    session, cache, store, limiter = transport.get_session(), transport.get_cache(), base_classes.get_store(), transport.limiter
+    old_parser, old_fast_extraction = parsing.get_parser(), parsing.fast_extraction_enabled()
+    transport.set_session(FixtureSession(corpus))
+    transport.set_cache(None)
+    base_classes.set_store(None)
+    transport.limiter = TokenBucket(calls=10 ** 9, period=1)
+    if parser:
+        parsing.set_parser(parser)
+    parsing.set_fast_extraction(fast_extraction)
+    try:
+        yield
+    finally:
+        transport.set_session(session)
+        transport.set_cache(cache)
+        base_classes.set_store(store)
+        transport.limiter = limiter
+        parsing.set_parser(old_parser)
+        parsing.set_fast_extraction(old_fast_extraction)
@@ -0,0 +1,119 @@
+import hashlib
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from .. import transport
+from ..ratelimiter import TokenBucket
+from .fixtures import *
+
+class StandInServer:
+    # serves the corpus pages at the paths rympy requests them under, with knobs for
+    # the ways the real site slows down: latency, throttling with 503s, slow bodies.
+    # Collection pages past the saved ones are served as copies of the first page,
+    # up to pages
+    def __init__(self, corpus=None, *, host="127.0.0.1", port=0, latency=0, throttle=None, error_rate=0,
+                 slow_body=None, pages=1) -> None:
+        corpus = corpus or Corpus()
+        self.pages = {_path(page["url"]): corpus.content(page) for page in corpus.pages}
+        self.latency = latency
+        self.throttle = TokenBucket(calls=throttle[0], period=throttle[1], burst=throttle[0]) if throttle else None
+        self.error_rate = error_rate
+        self.slow_body = slow_body
+        self.page_count = pages
+        self.stats = {"requests": 0, "rate_limited": 0, "not_found": 0, "not_modified": 0}
+        self._stats_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+        self._thread = None
+        self._previous_root_url = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        # requests for rateyourmusic.com pages go to this server while it runs
+        self.start()
+        self._previous_root_url = transport._root_url
+        transport.set_root_url(self.url)
+        return self
+
+    def __exit__(self, *exc_info):
+        transport.set_root_url(self._previous_root_url)
+        self.stop()
+
+    def count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def find(self, path):
+        for candidate in (path, path.rstrip("/"), path.rstrip("/") + "/"):
+            if (content := self.pages.get(candidate)) is not None:
+                return content
+        if (match := re.fullmatch(r"(.*/)(\d+)(/?)", path)) and 1 <= int(match.group(2)) <= self.page_count:
+            return self.find(f"{match.group(1)}1{match.group(3)}") if match.group(2) != "1" else None
+
+    def latency_seconds(self):
+        if isinstance(self.latency, (tuple, list)):
+            return random.uniform(*self.latency)
+        return self.latency
+
+def _handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            server.count("requests")
+            if latency := server.latency_seconds():
+                time.sleep(latency)
+
+            if (server.throttle and server.throttle.try_acquire()) or random.random() < server.error_rate:
+                server.count("rate_limited")
+                return self._send(503, b"", {"Retry-After": "60"})
+
+            if (content := server.find(_path(self.path))) is None:
+                server.count("not_found")
+                return self._send(404, b"")
+
+            etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                server.count("not_modified")
+                return self._send(304, b"", {"ETag": etag})
+            self._send(200, content, {"Content-Type": "text/html; charset=utf-8", "ETag": etag})
+
+        def _send(self, status, body, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if not server.slow_body:
+                self.wfile.write(body)
+                return
+            # slow_body is in bytes per second, sent in small chunks
+            chunk_size = 4096
+            for start in range(0, len(body), chunk_size):
+                self.wfile.write(body[start:start + chunk_size])
+                self.wfile.flush()
+                time.sleep(chunk_size / server.slow_body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def _path(url):
+    return urlsplit(url).path or "/"
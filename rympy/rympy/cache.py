@@ -0,0 +1,105 @@
+import json
+import sqlite3
+import threading
+import time
+import requests
+from .global_variables import *
+
+class ResponseCache:
+    def __init__(self, path=CACHE_PATH, *, max_size=CACHE_MAX_SIZE, ttls=None) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.ttls = {**CACHE_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""CREATE TABLE IF NOT EXISTS responses (
+                                            url TEXT PRIMARY KEY,
+                                            kind TEXT NOT NULL,
+                                            status INTEGER NOT NULL,
+                                            headers TEXT NOT NULL,
+                                            encoding TEXT,
+                                            content BLOB NOT NULL,
+                                            size INTEGER NOT NULL,
+                                            stored_at REAL NOT NULL,
+                                            accessed_at REAL NOT NULL)""")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        # total size of the stored bodies, kept up to date on every write so that
+        # eviction doesn't have to sum the table
+        self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def caches(self, kind):
+        return kind in self.ttls
+
+    def get(self, url):
+        with self._lock:
+            row = self._connection.execute("SELECT kind, status, headers, encoding, content, stored_at FROM responses WHERE url = ?",
+                                           (url,)).fetchone()
+            if not row:
+                return None
+
+            kind, status, headers, encoding, content, stored_at = row
+            now = time.time()
+            with self._connection:
+                if self.ttls.get(kind) is not None and now - stored_at > self.ttls[kind]:
+                    self._delete(url)
+                    return None
+                self._connection.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+
+        response = build_response(url, status, json.loads(headers), encoding, content)
+        response.from_cache = True
+        return response
+
+    def set(self, url, kind, response):
+        content = response.content
+        now = time.time()
+        with self._lock, self._connection:
+            self._delete(url)
+            self._connection.execute("INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                     (url, kind, response.status_code, json.dumps(dict(response.headers)),
+                                      response.encoding, content, len(content), now, now))
+            self._size += len(content)
+            self._evict()
+
+    def invalidate(self, url):
+        with self._lock, self._connection:
+            self._delete(url)
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self._size = 0
+
+    def size(self):
+        return self._size
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _delete(self, url):
+        if row := self._connection.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone():
+            self._connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._size -= row[0]
+
+    def _evict(self):
+        if self._size <= self.max_size:
+            return
+
+        evicted = list()
+        for url, size in self._connection.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+            evicted.append((url,))
+            self._size -= size
+            if self._size <= self.max_size:
+                break
+        self._connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
+
+def build_response(url, status, headers, encoding, content):
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response.headers.update(headers)
+    response.encoding = encoding
+    response._content = content
+    response._content_consumed = True
+    return response
@@ -0,0 +1,230 @@
+import json
+import os
+import time
+from collections import deque
+from urllib.parse import urljoin
+from .rym import *
+from .transport import canonical_url
+
+class Crawler:
+    # walks the links the parsers expose, breadth first from the seeds. The frontier,
+    # the visited URLs, the pages of every collection seed already read and the
+    # failures are written to checkpoint_path so that a killed crawl picks up where
+    # it stopped. Every write holds the whole state, so they are batched: a crawl
+    # killed outright repeats at most the pages since the last one
+    def __init__(self, seeds=(), *, max_depth=1, kinds=None, checkpoint_path=None, checkpoint_every=CHECKPOINT_EVERY,
+                 checkpoint_interval=CHECKPOINT_INTERVAL, store=None) -> None:
+        self.max_depth = max_depth
+        self.kinds = set(kinds) if kinds else None
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.store = store
+        self.frontier = deque()
+        self.seen = set()
+        self.visited = set()
+        self.failed = dict()
+        # collection seeds (charts) by canonical URL: class, URL, depth, the pages
+        # handled so far and the page count once the first page was read
+        self.collections = dict()
+        self._collection_objects = dict()
+        self._since_checkpoint = 0
+        self._checkpointed_at = time.monotonic()
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            self._restore()
+        for seed in seeds:
+            self.add(seed)
+
+    def add(self, seed, depth=0):
+        if isinstance(seed, EntryCollection):
+            url = canonical_url(seed.url)
+            if url not in self.visited:
+                self._collection_objects[url] = seed
+                self.collections.setdefault(url, {"class": type(seed).__qualname__, "url": seed.url, "depth": depth,
+                                                  "page": 0, "max_page": None})
+            return
+        url = canonical_url(seed if isinstance(seed, str) else seed.url)
+        if url in self.seen or depth > self.max_depth or not self._wanted(url):
+            return
+        self.seen.add(url)
+        if issubclass(cls := entity_class(url), EntryCollection):
+            self.collections[url] = {"class": cls.__qualname__, "url": url, "depth": depth, "page": 0, "max_page": None}
+        else:
+            self.frontier.append((url, depth))
+
+    def crawl(self):
+        # yields every entity fetched, in the order they are visited
+        try:
+            for url, state in list(self.collections.items()):
+                try:
+                    collection = self._collection(url, state)
+                    self._read_pages(collection, state)
+                except RateLimit:
+                    raise
+                except Exception as exception:
+                    del self.collections[url]
+                    self._collection_objects.pop(url, None)
+                    self.failed[url] = repr(exception)
+                    self._visited(url)
+                    continue
+
+                del self.collections[url]
+                self._collection_objects.pop(url, None)
+                self._visited(url)
+                yield collection
+
+            while self.frontier:
+                # the URL leaves the frontier only once it is handled, so a crawl stopped
+                # by a rate limit retries it on resume
+                url, depth = self.frontier[0]
+                try:
+                    entity = get_entity(url)
+                    if self.store:
+                        self.store.save(entity)
+                    links = list(self._links(entity)) if depth < self.max_depth else ()
+                except RateLimit:
+                    raise
+                except Exception as exception:
+                    self.frontier.popleft()
+                    self.failed[url] = repr(exception)
+                    self._visited(url)
+                    continue
+
+                for link in links:
+                    self._follow(link, depth)
+                self.frontier.popleft()
+                self._visited(url)
+                yield entity
+        finally:
+            self.checkpoint()
+
+    def checkpoint(self):
+        if not self.checkpoint_path:
+            return
+        state = {"frontier": list(self.frontier),
+                 "seen": list(self.seen),
+                 "visited": list(self.visited),
+                 "collections": self.collections,
+                 "failed": self.failed}
+        temporary_path = self.checkpoint_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+        os.replace(temporary_path, self.checkpoint_path)
+        self._since_checkpoint = 0
+        self._checkpointed_at = time.monotonic()
+
+    def _restore(self):
+        with open(self.checkpoint_path, encoding="utf-8") as file:
+            state = json.load(file)
+        self.frontier = deque((url, depth) for url, depth in state["frontier"])
+        self.seen = set(state["seen"])
+        self.visited = set(state["visited"])
+        self.collections = state.get("collections", dict())
+        self.failed = state["failed"]
+
+    def _collection(self, url, state):
+        if (collection := self._collection_objects.get(url)) is None:
+            cls = _collection_class(state["class"])
+            if state["page"] == 0:
+                collection = Chart.from_url(state["url"]) if cls is Chart else cls(state["url"])
+            else:
+                collection = _resumed_collection(cls, state)
+        state["url"] = collection.init_url
+        state["max_page"] = collection.max_page
+        return collection
+
+    def _read_pages(self, collection, state):
+        while state["page"] < state["max_page"]:
+            if len(collection.entries) <= state["page"]:
+                collection.load_more_entries()
+            # entries of a page are followed before the page counts as handled,
+            # so a resumed crawl requests only the pages after it
+            for entry in collection.entries[state["page"]]:
+                self._follow(entry, state["depth"])
+            state["page"] += 1
+            self._checkpoint_step()
+
+    def _visited(self, url):
+        self.visited.add(canonical_url(url))
+        self._checkpoint_step()
+
+    def _checkpoint_step(self):
+        self._since_checkpoint += 1
+        if (self._since_checkpoint >= self.checkpoint_every
+                or time.monotonic() - self._checkpointed_at >= self.checkpoint_interval):
+            self.checkpoint()
+
+    def _wanted(self, url):
+        try:
+            cls = entity_class(url)
+        except NoURL:
+            return False
+        return self.kinds is None or cls._kind in self.kinds
+
+    def _follow(self, link, depth):
+        if url := _link_url(link):
+            self.add(url, depth + 1)
+
+    def _links(self, entity):
+        match entity:
+            case Release():
+                yield from _attribute(entity, "artists")
+                yield from _attribute(entity, "credited_artists")
+                yield from _attribute(entity, "primary_genres")
+                yield from _attribute(entity, "secondary_genres")
+                yield from (issue.label for issue in _attribute(entity, "issues") if issue.label)
+            case Artist():
+                for collection in (_value(entity, "discography"), _value(entity, "appears_on")):
+                    if collection:
+                        for releases in vars(collection).values():
+                            if isinstance(releases, list):
+                                yield from releases
+                yield from _attribute(entity, "members")
+                yield from _attribute(entity, "member_of")
+                yield from _attribute(entity, "related_artists")
+            case Genre():
+                yield from _attribute(entity, "parent_genres")
+                yield from _attribute(entity, "children_genres")
+                yield from _attribute(entity, "top_ten_albums")
+            case Label():
+                yield from _attribute(entity, "distributors")
+
+def _collection_class(qualified_name):
+    cls = globals()[qualified_name.split(".")[0]]
+    for name in qualified_name.split(".")[1:]:
+        cls = getattr(cls, name)
+    return cls
+
+def _resumed_collection(cls, state):
+    # the pages before state["page"] were handled before the crawl stopped, they are
+    # left empty so that entries still holds one list per page, and only the later
+    # ones are requested
+    collection = cls.__new__(cls)
+    if cls is Chart:
+        collection._prepare_url(state["url"])
+    else:
+        EntryCollection._prepare(collection, state["url"])
+    collection.current_page = state["page"]
+    collection.current_url = collection._page_url(state["page"])
+    collection.max_page = state["max_page"]
+    collection.entries = [list() for _ in range(state["page"])]
+    return collection
+
+def _value(entity, name):
+    # a field the page doesn't have the expected markup for is skipped rather than
+    # stopping the crawl
+    try:
+        return getattr(entity, name)
+    except (AttributeError, ParseError, IndexError, KeyError, TypeError):
+        return None
+
+def _attribute(entity, name):
+    return _value(entity, name) or ()
+
+def _link_url(link):
+    if isinstance(link, SimpleGenre) and not link.url and link.name:
+        return f"{ROOT_URL}/genre/{link.name.replace(' ', '-').lower()}/"
+    # names listed without a link, like the plain strings of Artist.member_of, have no URL
+    if url := getattr(link, "url", None):
+        return urljoin(ROOT_URL, url)
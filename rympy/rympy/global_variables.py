@@ -1,4 +1,28 @@
 HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_10_1) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/39.0.2171.95 Safari/537.36'}
 ROOT_URL = "https://rateyourmusic.com"
 CALL_LIMIT = 1
-RATE_LIMIT = 60
\ No newline at end of file
+RATE_LIMIT = 60
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+
+CACHE_PATH = "rympy_cache.sqlite3"
+CACHE_MAX_SIZE = 512 * 1024 * 1024
+# seconds a cached page stays fresh, per entity kind
+CACHE_TTLS = {"chart": 6 * 60 * 60,
+              "collection": 24 * 60 * 60,
+              "release": 3 * 24 * 60 * 60,
+              "user": 24 * 60 * 60,
+              "genre": 14 * 24 * 60 * 60,
+              "label": 14 * 24 * 60 * 60,
+              "distributor": 30 * 24 * 60 * 60,
+              "artist": 30 * 24 * 60 * 60}
+
+IDENTITY_MAP_SIZE = 1024
+
+BURST_LIMIT = CALL_LIMIT
+STORE_PATH = "rympy_store.sqlite3"
+
+# a crawl writes its checkpoint after this many visited pages or seconds, whichever
+# comes first, and always when it stops
+CHECKPOINT_EVERY = 100
+CHECKPOINT_INTERVAL = 60
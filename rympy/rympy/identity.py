@@ -0,0 +1,80 @@
+import threading
+import weakref
+from collections import OrderedDict
+from .transport import canonical_url
+from .global_variables import *
+
+class IdentityMap:
+    # hydrated objects stay reachable while anything references them; the most
+    # recently used max_size ones are also kept alive by the map itself
+    def __init__(self, max_size=IDENTITY_MAP_SIZE) -> None:
+        self.max_size = max_size
+        self._entities = weakref.WeakValueDictionary()
+        self._recent = OrderedDict()
+        self._pending = dict()
+        self._lock = threading.RLock()
+
+    def get(self, cls, url):
+        if not url:
+            return None
+        key = (cls, canonical_url(url))
+        with self._lock:
+            if (entity := self._entities.get(key)) is not None:
+                self._touch(key, entity)
+            return entity
+
+    def add(self, entity):
+        if not getattr(entity, "url", None):
+            return entity
+        key = (type(entity), canonical_url(entity.url))
+        with self._lock:
+            if (existing := self._entities.get(key)) is not None and existing is not entity:
+                entity = existing
+            self._entities[key] = entity
+            self._touch(key, entity)
+        return entity
+
+    def get_or_create(self, cls, url, factory):
+        if (entity := self.get(cls, url)) is not None:
+            return entity
+        if not url:
+            return self.add(factory())
+
+        # concurrent hydrations of the same page wait for the first one
+        key = (cls, canonical_url(url))
+        with self._lock:
+            pending = self._pending.setdefault(key, [threading.Lock(), 0])
+            pending[1] += 1
+        try:
+            with pending[0]:
+                if (entity := self.get(cls, url)) is not None:
+                    return entity
+                return self.add(factory())
+        finally:
+            with self._lock:
+                pending[1] -= 1
+                if not pending[1]:
+                    del self._pending[key]
+
+    def discard(self, entity):
+        key = (type(entity), canonical_url(entity.url))
+        with self._lock:
+            if self._entities.get(key) is entity:
+                del self._entities[key]
+            self._recent.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
+            self._recent.clear()
+
+    def __len__(self):
+        return len(self._entities)
+
+    def _touch(self, key, entity):
+        self._recent[key] = entity
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_size:
+            self._recent.popitem(last=False)
+
+identity_map = IdentityMap()
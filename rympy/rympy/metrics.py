@@ -0,0 +1,144 @@
+import threading
+import time
+from contextlib import contextmanager
+
+# upper bounds of the histogram buckets, in seconds for timings
+HISTOGRAM_BOUNDS = tuple(0.0005 * 2 ** exponent for exponent in range(18))
+
+class MetricEvent:
+    __slots__ = ("name", "entity", "value", "tags")
+    def __init__(self, name, entity, value, tags) -> None:
+        self.name = name
+        self.entity = entity
+        self.value = value
+        self.tags = tags
+
+    def __repr__(self):
+        return f"MetricEvent: {self.entity} {self.name}={self.value!r}"
+
+class Histogram:
+    # bucket counts with fixed bounds, so a long crawl uses constant memory.
+    # Percentiles are the upper bound of the bucket they fall in
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for bucket, bound in enumerate(HISTOGRAM_BOUNDS):
+            if value <= bound:
+                break
+        else:
+            bucket = len(HISTOGRAM_BOUNDS)
+        self.buckets[bucket] += 1
+
+    def percentile(self, percent):
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(HISTOGRAM_BOUNDS[bucket], self.max) if bucket < len(HISTOGRAM_BOUNDS) else self.max
+        return self.max
+
+    def summary(self):
+        return {"count": self.count,
+                "total": self.total,
+                "mean": self.total / self.count if self.count else None,
+                "min": self.min,
+                "max": self.max,
+                "p50": self.percentile(50),
+                "p95": self.percentile(95),
+                "p99": self.percentile(99)}
+
+    def __repr__(self):
+        return f"Histogram: {self.count} values, {self.total:.3f} total"
+
+class Metrics:
+    # counters and histograms per entity type (the class name of what was being
+    # fetched, or the transport kind when there was no entity)
+    def __init__(self) -> None:
+        self.enabled = True
+        self.counters = dict()
+        self.histograms = dict()
+        self._subscribers = list()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        # callback receives every MetricEvent, from whichever thread emitted it
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [subscriber for subscriber in self._subscribers if subscriber is not callback]
+
+    def count(self, name, entity, amount=1, **tags):
+        if self.enabled:
+            with self._lock:
+                key = (entity, name)
+                self.counters[key] = self.counters.get(key, 0) + amount
+        self._notify(name, entity, amount, tags)
+
+    def observe(self, name, entity, value, **tags):
+        if self.enabled:
+            with self._lock:
+                if (histogram := self.histograms.get((entity, name))) is None:
+                    histogram = self.histograms[(entity, name)] = Histogram()
+                histogram.add(value)
+        self._notify(name, entity, value, tags)
+
+    @contextmanager
+    def timer(self, name, entity, **tags):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, entity, time.perf_counter() - start, **tags)
+
+    def report(self):
+        with self._lock:
+            report = dict()
+            for (entity, name), value in self.counters.items():
+                report.setdefault(entity, dict())[name] = value
+            for (entity, name), histogram in self.histograms.items():
+                report.setdefault(entity, dict())[name] = histogram.summary()
+        return report
+
+    def reset(self):
+        with self._lock:
+            self.counters = dict()
+            self.histograms = dict()
+
+    def _notify(self, name, entity, value, tags):
+        if subscribers := self._subscribers:
+            event = MetricEvent(name, entity, value, tags)
+            for subscriber in subscribers:
+                subscriber(event)
+
+# not named metrics, which would shadow this module in the rympy namespace
+stats = Metrics()
+
+def format_metrics(report=None):
+    # where the time went per entity type: waiting on the rate limiter, on the
+    # network, or parsing and extracting
+    report = stats.report() if report is None else report
+    lines = [f"{'entity':<28}{'requests':>9}{'cached':>8}{'MB':>8}{'limiter s':>11}{'network s':>11}{'parse s':>10}{'extract s':>11}"]
+    for entity, values in sorted(report.items()):
+        def total(name):
+            return values.get(name, {}).get("total", 0)
+        lines.append(f"{entity:<28}{values.get('requests', 0):>9}{values.get('cache_hits', 0):>8}"
+                     f"{values.get('bytes', 0) / 1024 / 1024:>8.2f}{total('rate_limit_wait'):>11.3f}"
+                     f"{total('latency'):>11.3f}{total('parse'):>10.3f}{total('extract'):>11.3f}")
+        if statuses := {name: count for name, count in values.items() if name.startswith("status_")}:
+            lines.append(" " * 4 + ", ".join(f"{name[7:]}: {count}" for name, count in sorted(statuses.items())))
+    return "\n".join(lines)
@@ -0,0 +1,118 @@
+import bs4
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+try:
+    import html5lib
+except ImportError:
+    html5lib = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+PARSERS = ("lxml", "html.parser", "html5lib")
+
+# lxml is faster but builds slightly different trees from broken markup, so it is
+# only used when asked for with set_parser
+_parser = "html.parser"
+_fast_extraction = False
+
+def set_parser(parser):
+    global _parser
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser '{parser}', pick one of {', '.join(PARSERS)}.")
+    if {"lxml": lxml, "html5lib": html5lib}.get(parser, bs4) is None:
+        raise ImportError(f"The {parser} parser requires {parser} to be installed.")
+    _parser = parser
+
+def get_parser():
+    return _parser
+
+def set_fast_extraction(enabled=True):
+    # selectolax backed extractors for the heaviest list pages, see fast_* below
+    global _fast_extraction
+    if enabled and LexborHTMLParser is None:
+        raise ImportError("Fast extraction requires selectolax to be installed.")
+    _fast_extraction = enabled
+
+def fast_extraction_enabled():
+    return _fast_extraction
+
+def make_soup(content):
+    return bs4.BeautifulSoup(content, _parser)
+
+def make_tree(content):
+    if _fast_extraction:
+        return LexborHTMLParser(content)
+
+def _contents(node):
+    return list(node.iter(include_text=True))
+
+def fast_text(tree, selector):
+    if node := tree.css_first(selector):
+        return node.text()
+
+def fast_max_page(tree, pages_class):
+    # a class string with spaces has to match the whole attribute, as with bs4
+    selector = f'[class="{pages_class}"]' if " " in pages_class else "." + pages_class
+    if pages := tree.css(selector):
+        return int(pages[-1].text())
+    return 0
+
+def fast_tracks(tree):
+    if not (tracks_elem := tree.css_first("#tracks")):
+        return None
+
+    tracks = list()
+    for track in tracks_elem.css('div[itemprop="track"]'):
+        title_elem = track.css_first("span.tracklist_title")
+        tracks.append((track.css_first("span.tracklist_num").text().replace("\n","").replace(" ", ""),
+                       title_elem.text().replace("\n",""),
+                       int(_contents(title_elem)[1].attributes["data-inseconds"])))
+    return tracks
+
+def fast_chart_entries(tree):
+    entries = list()
+    for entry in _contents(tree.css_first("section#page_charts_section_charts"))[:-1:2]:
+        locale_elem = entry.css_first(".ui_name_locale")
+        entries.append((entry.css_first("div.page_charts_section_charts_item_credited_links_primary").text().replace("\n", "")
+                        + " - " + entry.css_first("div.page_charts_section_charts_item_title").text().replace("\n", ""),
+                        locale_elem.text() if locale_elem else "None",
+                        _contents(_contents(entry)[1])[1].attributes["href"]))
+    return entries
+
+def fast_credited_collaboration(tree):
+    if collab_elem := tree.css_first(".credited_name"):
+        return (_contents(collab_elem)[0].text(),
+                [(artist.text(), artist.attributes["href"]) for artist in collab_elem.css(".disco_sub_artist")])
+
+def fast_discography(tree, elem_id):
+    if not (releases_elem := tree.css_first("#" + elem_id)):
+        return None
+
+    return [_disco_release(release) for release in releases_elem.css(".disco_release")]
+
+def fast_features(tree):
+    # appears on releases with the text naming their type
+    if not (releases_elem := tree.css_first("#disco_type_a")):
+        return None
+    return [(_disco_release(release), release.css_first(".disco_subline").css_first(".subtext").text())
+            for release in releases_elem.css(".disco_release")]
+
+def _disco_release(release):
+    date_elem = release.css_first(".disco_subline")
+    artist_elem = release.css_first(".disco_sub_artist")
+    info_elem = _contents(release.css_first(".disco_info"))[0]
+    average_elem = release.css_first(".disco_avg_rating")
+    return {"title": info_elem.attributes["title"],
+            "href": info_elem.attributes["href"],
+            "date_text": date_elem.css_first("span").attributes["title"] if date_elem else None,
+            "sub_artist": (artist_elem.text(), artist_elem.attributes["href"]) if artist_elem else None,
+            "number_of_ratings": release.css_first(".disco_ratings").text(),
+            "number_of_reviews": release.css_first(".disco_reviews").text(),
+            "average_rating": average_elem.text() if average_elem else None}
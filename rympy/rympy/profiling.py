@@ -0,0 +1,131 @@
+import heapq
+import threading
+import time
+from functools import wraps
+from .metrics import Histogram
+
+_profiling = False
+_calls = threading.local()
+
+def set_profiling(enabled=True):
+    # profiled entities time every extractor and the helpers decorated with
+    # profiled, see instance_profile and profiler.report
+    global _profiling
+    _profiling = enabled
+
+def profiling_enabled():
+    return _profiling
+
+class ProfileNode:
+    __slots__ = ("name", "owner", "url", "seconds", "children")
+    def __init__(self, name, owner, url) -> None:
+        self.name = name
+        self.owner = owner
+        self.url = url
+        self.seconds = 0
+        self.children = list()
+
+    @property
+    def self_seconds(self):
+        return self.seconds - sum(child.seconds for child in self.children)
+
+    def to_dict(self):
+        return {"name": self.name,
+                "owner": self.owner,
+                "seconds": self.seconds,
+                "self_seconds": self.self_seconds,
+                "children": [child.to_dict() for child in self.children]}
+
+    def __repr__(self):
+        return f"ProfileNode: {self.owner}.{self.name} {self.seconds * 1000:.2f} ms"
+
+class Profiler:
+    # timings of every profiled call of a run, per class and method, with the
+    # pages that took longest for each
+    def __init__(self, slowest=5) -> None:
+        self.slowest = slowest
+        self.histograms = dict()
+        self._slowest = dict()
+        self._lock = threading.Lock()
+
+    def record(self, node):
+        key = (node.owner, node.name)
+        with self._lock:
+            if (histogram := self.histograms.get(key)) is None:
+                histogram = self.histograms[key] = Histogram()
+                self._slowest[key] = list()
+            histogram.add(node.seconds)
+            slowest = self._slowest[key]
+            if len(slowest) < self.slowest:
+                heapq.heappush(slowest, (node.seconds, node.url or ""))
+            elif node.seconds > slowest[0][0]:
+                heapq.heapreplace(slowest, (node.seconds, node.url or ""))
+
+    def report(self):
+        with self._lock:
+            report = dict()
+            for (owner, name), histogram in self.histograms.items():
+                report.setdefault(owner, dict())[name] = dict(histogram.summary(),
+                                                              slowest=sorted(self._slowest[(owner, name)], reverse=True))
+        return report
+
+    def reset(self):
+        with self._lock:
+            self.histograms = dict()
+            self._slowest = dict()
+
+profiler = Profiler()
+
+def profile_call(instance, name, function):
+    # calls made while another profiled call runs become its children. A call that
+    # is the outermost one for its instance is also kept in that instance's profile
+    stack = getattr(_calls, "stack", None)
+    if stack is None:
+        stack = _calls.stack = list()
+    parent = stack[-1] if stack else None
+    url = getattr(instance, "url", None) or getattr(getattr(instance, "artist", None), "url", None) or (parent and parent[0].url)
+    node = ProfileNode(name, type(instance).__qualname__, url)
+    stack.append((node, instance))
+    start = time.perf_counter()
+    try:
+        return function()
+    finally:
+        node.seconds = time.perf_counter() - start
+        stack.pop()
+        if parent is not None:
+            parent[0].children.append(node)
+        if parent is None or parent[1] is not instance:
+            instance.__dict__.setdefault("_profile", list()).append(node)
+        profiler.record(node)
+
+def profiled(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _profiling:
+            return method(self, *args, **kwargs)
+        return profile_call(self, method.__name__, lambda: method(self, *args, **kwargs))
+    return wrapper
+
+def instance_profile(obj):
+    # the calls timed while obj was built and its fields read, outermost first
+    return [node.to_dict() for node in obj.__dict__.get("_profile", ())]
+
+def format_profile(obj=None):
+    # one object's call tree, or the run totals per class and method
+    if obj is not None:
+        lines = list()
+        def add(node, depth):
+            lines.append(f"{'  ' * depth}{node.name:<{40 - 2 * depth}}{node.seconds * 1000:>10.2f} ms{node.self_seconds * 1000:>10.2f} ms self")
+            for child in node.children:
+                add(child, depth + 1)
+        for node in obj.__dict__.get("_profile", ()):
+            add(node, 0)
+        return "\n".join(lines)
+
+    lines = [f"{'method':<56}{'calls':>7}{'total ms':>11}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}  slowest"]
+    rows = [(owner, name, values) for owner, methods in profiler.report().items() for name, values in methods.items()]
+    for owner, name, values in sorted(rows, key=lambda row: row[2]["total"], reverse=True):
+        slowest_url = values["slowest"][0][1] if values["slowest"] else ""
+        lines.append(f"{owner + '.' + name:<56}{values['count']:>7}{values['total'] * 1000:>11.2f}{values['p50'] * 1000:>9.2f}"
+                     f"{values['p99'] * 1000:>9.2f}{values['max'] * 1000:>9.2f}  {slowest_url}")
+    return "\n".join(lines)
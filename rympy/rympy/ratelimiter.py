@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+from .global_variables import *
+
+class TokenBucket:
+    def __init__(self, *, calls=CALL_LIMIT, period=RATE_LIMIT, burst=BURST_LIMIT) -> None:
+        self._lock = threading.Lock()
+        self.configure(calls=calls, period=period, burst=burst)
+
+    def configure(self, *, calls=CALL_LIMIT, period=RATE_LIMIT, burst=None):
+        with self._lock:
+            self.rate = calls / period
+            self.burst = burst or calls
+            self._tokens = self.burst
+            self._updated = time.monotonic()
+
+    def try_acquire(self):
+        # takes a token if one is available, otherwise returns the seconds until there is one
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        waited = 0
+        while wait := self.try_acquire():
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    async def aacquire(self):
+        waited = 0
+        while wait := self.try_acquire():
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+    def remaining(self):
+        with self._lock:
+            self._refill()
+            return int(self._tokens)
+
+    def next_slot_at(self):
+        with self._lock:
+            self._refill()
+            wait = 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+        return time.time() + wait
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+limiter = TokenBucket()
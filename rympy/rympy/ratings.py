@@ -0,0 +1,268 @@
+import csv
+import statistics
+import sys
+import threading
+from array import array
+from bisect import insort
+from . import transport
+from .base_classes import check_response
+from .exceptions import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class Rating:
+    __slots__ = ("id", "artist_name", "artist_name_localized", "title", "release_year", "rating", "ownership", "purchase_date", "media_type", "review", "url", "release")
+    def __init__(self, *, id=None, first_name="", last_name="", first_name_localized="",
+                 last_name_localized="", title=None, release_year=None, rating=None,
+                 ownership=None, purchase_date=None, media_type=None, review=None, url=None, release=None) -> None:
+        self.id = id
+        self.artist_name = (first_name + " " + last_name).strip()
+        self.artist_name_localized = (first_name_localized + " " + last_name_localized).strip()
+        self.title = title
+        self.release_year = release_year
+        self.rating = rating
+        self.ownership = ownership
+        self.purchase_date = purchase_date
+        self.media_type = media_type
+        self.review = review
+        self.url = url
+        self.release = release
+
+    def __eq__(self, other) -> bool:
+        return self.id == other.id or (self.url and len(self.url) and self.url == other.url)
+
+class RatingIndex:
+    # list of ratings in insertion order, with the positions of every id and url
+    # kept alongside so that finding a rating equal to another one is a dict lookup
+    def __init__(self, ratings=None) -> None:
+        self._ratings = list()
+        self._ids = dict()
+        self._urls = dict()
+        for rating in ratings or ():
+            self.append(rating)
+
+    def find(self, rating):
+        # same result as the position of the first stored rating == rating
+        positions = list()
+        if (id_positions := self._ids.get(rating.id)):
+            positions.append(id_positions[0])
+        if rating.url and (url_positions := self._urls.get(rating.url)):
+            positions.append(url_positions[0])
+        return min(positions) if positions else None
+
+    def append(self, rating):
+        self._ratings.append(rating)
+        self._index(rating, len(self._ratings) - 1)
+
+    def index(self, rating):
+        if (position := self.find(rating)) is None:
+            raise ValueError("Rating is not in the index.")
+        return position
+
+    def _index(self, rating, position):
+        insort(self._ids.setdefault(rating.id, list()), position)
+        if rating.url:
+            insort(self._urls.setdefault(rating.url, list()), position)
+
+    def _unindex(self, rating, position):
+        self._ids[rating.id].remove(position)
+        if not self._ids[rating.id]:
+            del self._ids[rating.id]
+        if rating.url:
+            self._urls[rating.url].remove(position)
+            if not self._urls[rating.url]:
+                del self._urls[rating.url]
+
+    def __setitem__(self, position, rating):
+        position = range(len(self._ratings))[position]
+        self._unindex(self._ratings[position], position)
+        self._ratings[position] = rating
+        self._index(rating, position)
+
+    def __getitem__(self, position):
+        return self._ratings[position]
+
+    def __contains__(self, rating):
+        return self.find(rating) is not None
+
+    def __iter__(self):
+        return iter(self._ratings)
+
+    def __len__(self):
+        return len(self._ratings)
+
+    def __repr__(self):
+        return repr(self._ratings)
+
+def iter_ratings(*, filename=None, url=None):
+    # rows are read and converted one at a time, so an export never sits in memory whole
+    if filename:
+        return _iter_file_ratings(filename)
+    if url:
+        response = transport.get(url, stream=True)
+        check_response(response, "Ratings request failed")
+        return _iter_response_ratings(response)
+    raise NoURL("Provide a filename or an URL.")
+
+def _iter_file_ratings(filename):
+    # opened on the first next(), so an iterator that is never consumed holds no file
+    with open(filename, 'r', encoding="utf-8", newline="") as file:
+        yield from map(rating_from_row, csv.DictReader(file))
+
+def _iter_response_ratings(response):
+    response.encoding = response.encoding or "utf-8"
+    try:
+        yield from map(rating_from_row, csv.DictReader(_iter_response_lines(response)))
+    finally:
+        response.close()
+
+def _iter_response_lines(response, chunk_size=64 * 1024):
+    # unlike Response.iter_lines this keeps the line endings, which csv needs
+    # to read reviews spanning several lines
+    pending = ""
+    for chunk in response.iter_content(chunk_size, decode_unicode=True):
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+def rating_from_row(row):
+    return Rating(
+        id=row["RYM Album"],
+        first_name=row[" First Name"],
+        last_name=row["Last Name"],
+        first_name_localized=row["First Name localized"],
+        last_name_localized=row[" Last Name localized"],
+        title=row["Title"],
+        release_year=int(row["Release_Date"]) if row["Release_Date"] else None,
+        rating=int(row["Rating"])/2 if row["Rating"] != "" else None,
+        ownership=row["Ownership"],
+        purchase_date=row["Purchase Date"],
+        media_type=row["Media Type"],
+        review=row.get(" Review")
+    )
+
+class _Vocabulary:
+    # strings shared by every RatingsTable are stored once and referred to by code
+    def __init__(self) -> None:
+        self.values = list()
+        self._codes = dict()
+        self._lock = threading.Lock()
+
+    def code(self, value):
+        if (code := self._codes.get(value)) is not None:
+            return code
+        with self._lock:
+            if (code := self._codes.get(value)) is None:
+                code = len(self.values)
+                self.values.append(sys.intern(value) if isinstance(value, str) else value)
+                self._codes[value] = code
+            return code
+
+_release_ids = _Vocabulary()
+_artist_names = _Vocabulary()
+_ownerships = _Vocabulary()
+
+class RatingsTable:
+    # one typed array per column, about a dozen bytes per rating. Ratings are kept
+    # as half stars and missing ratings and years are stored as 0
+    def __init__(self) -> None:
+        self._release_ids = array("I")
+        self._ratings = array("B")
+        self._release_years = array("H")
+        self._ownerships = array("H")
+        self._artists = array("I")
+
+    @classmethod
+    def from_ratings(cls, ratings):
+        table = cls()
+        for rating in ratings:
+            table.append(rating)
+        return table
+
+    @classmethod
+    def from_export(cls, *, filename=None, url=None):
+        return cls.from_ratings(iter_ratings(filename=filename, url=url))
+
+    def append(self, rating):
+        self._release_ids.append(_release_ids.code(rating.id))
+        self._ratings.append(round(rating.rating * 2) if rating.rating is not None else 0)
+        self._release_years.append(rating.release_year or 0)
+        self._ownerships.append(_ownerships.code(rating.ownership))
+        self._artists.append(_artist_names.code(rating.artist_name))
+
+    def mean(self):
+        if np:
+            ratings = self._rated()
+            return float(ratings.mean()) / 2 if len(ratings) else None
+        ratings = [rating for rating in self._ratings if rating]
+        return statistics.fmean(ratings) / 2 if ratings else None
+
+    def median(self):
+        if np:
+            ratings = self._rated()
+            return float(np.median(ratings)) / 2 if len(ratings) else None
+        ratings = [rating for rating in self._ratings if rating]
+        return statistics.median(ratings) / 2 if ratings else None
+
+    def histogram(self):
+        # number of ratings per half star, from 0.5 to 5
+        if np:
+            counts = np.bincount(self._column(self._ratings), minlength=11).tolist()
+        else:
+            counts = [0] * 11
+            for rating in self._ratings:
+                counts[rating] += 1
+        return {half_stars / 2: counts[half_stars] for half_stars in range(1, 11)}
+
+    def ratings_per_year(self):
+        if np:
+            years = self._column(self._release_years)
+            found_years, counts = np.unique(years[years > 0], return_counts=True)
+            return dict(zip(found_years.tolist(), counts.tolist()))
+        counts = dict()
+        for year in self._release_years:
+            if year:
+                counts[year] = counts.get(year, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def artist_averages(self):
+        if np:
+            ratings = self._column(self._ratings)
+            rated = ratings > 0
+            artists = self._column(self._artists)[rated]
+            sums = np.bincount(artists, weights=ratings[rated])
+            counts = np.bincount(artists)
+            found_artists = np.flatnonzero(counts)
+            averages = sums[found_artists] / counts[found_artists] / 2
+            return {_artist_names.values[artist]: average for artist, average in zip(found_artists.tolist(), averages.tolist())}
+        sums = dict()
+        for artist, rating in zip(self._artists, self._ratings):
+            if rating:
+                total, count = sums.get(artist, (0, 0))
+                sums[artist] = (total + rating, count + 1)
+        return {_artist_names.values[artist]: total / count / 2 for artist, (total, count) in sums.items()}
+
+    def _column(self, column):
+        return np.frombuffer(column, dtype=column.typecode) if len(column) else np.zeros(0, dtype=column.typecode)
+
+    def _rated(self):
+        ratings = self._column(self._ratings)
+        return ratings[ratings > 0]
+
+    def __iter__(self):
+        for release_id, rating, release_year, ownership, artist in zip(self._release_ids, self._ratings, self._release_years,
+                                                                      self._ownerships, self._artists):
+            yield (_release_ids.values[release_id], rating / 2 if rating else None, release_year or None,
+                   _ownerships.values[ownership], _artist_names.values[artist])
+
+    def __len__(self):
+        return len(self._release_ids)
+
+    def __repr__(self):
+        return f"RatingsTable: {len(self)} ratings"
@@ -1,21 +1,59 @@
-import requests
+from . import transport
 import re
-import csv
 from datetime import datetime
 from datetime import timedelta
 from typing import List
 import json
 import bs4
 import ast
-from ratelimit import limits, sleep_and_retry
+from urllib.parse import urlsplit
 from .enums import *
 from .exceptions import *
 from .global_variables import *
 from .base_classes import *
+from .identity import identity_map
+from .metrics import stats
+from .profiling import profiled
+from .ratings import *
+from . import parsing
+
+def entity_class(url):
+    path = urlsplit(url).path
+    if "/release/" in path:
+        return Release
+    if path.startswith("/artist/"):
+        return Artist
+    if path.startswith("/genre/"):
+        return Genre
+    if path.startswith("/label/"):
+        return Label
+    if path.startswith("/~"):
+        return User
+    if path.startswith("/charts/"):
+        return Chart
+    raise NoURL(f"No entity type is known for {url}.")
+
+def get_entity(url):
+    cls = entity_class(url)
+    if cls is Chart:
+        url = Chart._first_page_url(url)
+        return identity_map.get_or_create(cls, url, lambda: Chart.from_url(url))
+    if cls in (Artist, Genre, User):
+        return identity_map.get_or_create(cls, url, lambda: cls(url=url))
+    return identity_map.get_or_create(cls, url, lambda: cls(url))
+
+def get_chart(**options):
+    # a chart built from options, shared like get_entity on the URL the options make
+    compact = options.pop("compact", None)
+    chart = Chart.__new__(Chart)
+    chart._prepare(**options)
+    return identity_map.get_or_create(Chart, chart.url, lambda: Chart(**options, compact=compact))
 
 class Chart(EntryCollection):
-    @sleep_and_retry
-    @limits(calls=CALL_LIMIT, period=RATE_LIMIT)
+    _kind = "chart"
+    _pages_class = "ui_pagination_number"
+    _fast_extractors = True
+
     def __init__(self, *, type=ChartType.top, release_types=None, release_type=None,
                  year_range=None, primary_genres=None,
                  secondary_genres=None, primary_genres_excluded=None,
@@ -23,7 +61,49 @@ class Chart(EntryCollection):
                  locations_excluded=None, languages=None,
                  languages_excluded=None, descriptors=None,
                  descriptors_excluded=None, include_subgenres=True,
-                 contain_all_genres=False) -> None:
+                 contain_all_genres=False, compact=None) -> None:
+        self._compact = compact
+        self._prepare(type=type, release_types=release_types, release_type=release_type,
+                      year_range=year_range, primary_genres=primary_genres,
+                      secondary_genres=secondary_genres, primary_genres_excluded=primary_genres_excluded,
+                      secondary_genres_excluded=secondary_genres_excluded, locations=locations,
+                      locations_excluded=locations_excluded, languages=languages,
+                      languages_excluded=languages_excluded, descriptors=descriptors,
+                      descriptors_excluded=descriptors_excluded, include_subgenres=include_subgenres,
+                      contain_all_genres=contain_all_genres)
+        self._fetch()
+
+    @classmethod
+    def from_url(cls, url, compact=None):
+        # a chart whose URL is already known, e.g. the one linked from a label page
+        chart = cls.__new__(cls)
+        chart._compact = compact
+        chart._prepare_url(url)
+        chart._fetch()
+        return chart
+
+    def _prepare_url(self, url):
+        # the type and release types are read back from the URL
+        self._prepare()
+        if match := re.search(r"/charts/([^/]+)/([^/]+)/", url):
+            self.type = match.group(1)
+            self.release_types = match.group(2).split(",")
+        EntryCollection._prepare(self, self._first_page_url(url))
+
+    @staticmethod
+    def _first_page_url(url):
+        if not re.search(r"/\d+/$", url):
+            url = url.rstrip("/") + "/1/"
+        return url
+
+    def _prepare(self, *, type=ChartType.top, release_types=None, release_type=None,
+                 year_range=None, primary_genres=None,
+                 secondary_genres=None, primary_genres_excluded=None,
+                 secondary_genres_excluded=None, locations=None,
+                 locations_excluded=None, languages=None,
+                 languages_excluded=None, descriptors=None,
+                 descriptors_excluded=None, include_subgenres=True,
+                 contain_all_genres=False):
         self.type = type
         self.release_types = release_types or [release_type] if release_type else [ReleaseType.album]
         self.year_range = year_range
@@ -39,8 +119,7 @@ class Chart(EntryCollection):
         self.descriptors_excluded = descriptors_excluded
         self.include_subgenres = include_subgenres
         self.contain_all_genres = contain_all_genres
-        self.init_url = self._fetch_url()
-        super().__init__(self.init_url, "ui_pagination_number")
+        super()._prepare(self._fetch_url())
 
     def _fetch_url(self):
         release_types_str = str()
@@ -78,6 +157,10 @@ class Chart(EntryCollection):
         return url + "/1/"
 
     def _specific_fetch(self):
+        if parsing.fast_extraction_enabled():
+            return [SimpleRelease(title=title, artist_name=artist_name, url=ROOT_URL + href)
+                    for title, artist_name, href in parsing.fast_chart_entries(self._tree)]
+
         chart_elem = self._soup.find("section", id="page_charts_section_charts").contents
         entries = [SimpleRelease(title=(entry.find("div", class_="page_charts_section_charts_item_credited_links_primary")
                                         .text.replace("\n", "") + " - " + entry.find("div", class_="page_charts_section_charts_item_title")
@@ -97,10 +180,25 @@ class Chart(EntryCollection):
     def _get_representation(self):
         return f"Chart: {self.type} {' '.join(self.release_types)}"
 
-class Genre:
-    @sleep_and_retry
-    @limits(calls=CALL_LIMIT, period=RATE_LIMIT)
-    def __init__(self, *, url=None, name=None) -> None:
+class Genre(Entity):
+    _kind = "genre"
+    _serialized_private = Entity._serialized_private + ("_url_name",)
+    name = LazyField("_fetch_name")
+    short_description = LazyField("_fetch_short_description")
+    description = LazyField("_fetch_description")
+    akas = LazyField("_fetch_akas")
+    parent_genres = LazyField("_fetch_parent_genres")
+    children_genres = LazyField("_fetch_children_genres")
+    top_ten_albums = LazyField("_fetch_top_ten")
+    lists = LazyField("_fetch_lists")
+
+    def __init__(self, *, url=None, name=None, eager=False, compact=None) -> None:
+        self._eager = eager
+        self._compact = compact
+        self._prepare(url=url, name=name)
+        self._fetch()
+
+    def _prepare(self, *, url=None, name=None):
         if not url and not name:
             raise ValueError("At least one of 'url' or 'name' must be provided.")
         if name:
@@ -108,29 +206,16 @@ class Genre:
         else:
             self._url_name = url.split("/")[-2]
         self.url = url or f"{ROOT_URL}/genre/{self._url_name}/"
-        self._cached_rym_response = requests.get(self.url, headers= HEADERS)
-        if self._cached_rym_response.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        if self._cached_rym_response.status_code != 200:
-            raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}")
-        self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
-        self.name = self._fetch_name()
-        self.short_description = self._fetch_short_description()
-        self.description = self._fetch_description()
-        self.akas = self._fetch_akas()
-        self.parent_genres = self._fetch_parent_genres()
-        self.children_genres = self._fetch_children_genres()
+
+    def _extract(self):
         self._top_chart = None
         self._bottom_chart = None
         self._esoteric_chart = None
-        self.top_ten_albums = self._fetch_top_ten()
-        self.lists = self._fetch_lists()
         self._oldest_releases = None
         self._newest_releases = None
 
     class GenreReleases(EntryCollection):
-        def __init__(self, url):
-            super().__init__(url, "ui_pagination_btn ui_pagination_number")
+        _pages_class = "ui_pagination_btn ui_pagination_number"
         
         def _specific_fetch(self):
             def get_cover(found_a):
@@ -166,26 +251,26 @@ class Genre:
     @property
     def top_chart(self):
         if not self._top_chart:
-            self._top_chart = Chart(type=ChartType.top, release_types=ReleaseType.album, primary_genres=[self])
+            self._top_chart = get_chart(type=ChartType.top, release_types=ReleaseType.album, primary_genres=[self])
         return self._top_chart
 
     @property
     def bottom_chart(self):
         if not self._bottom_chart:
-            self._bottom_chart = Chart(type=ChartType.bottom, release_types=ReleaseType, primary_genres=[self])
+            self._bottom_chart = get_chart(type=ChartType.bottom, release_types=ReleaseType, primary_genres=[self])
         return self._bottom_chart
     
     @property
     def esoteric_chart(self):
         if not self._esoteric_chart:
-            self._esoteric_chart = Chart(type=ChartType.esoteric, release_types=ReleaseType, primary_genres=[self])
+            self._esoteric_chart = get_chart(type=ChartType.esoteric, release_types=ReleaseType, primary_genres=[self])
         return self._esoteric_chart
         
     def chart(self, *, type=None, year_range=None):
         if not type:
-            return Chart(type=ChartType.top, release_types=ReleaseType.album, year_range=year_range, primary_genres=[self])
+            return get_chart(type=ChartType.top, release_types=ReleaseType.album, year_range=year_range, primary_genres=[self])
         else:
-            return Chart(type=type, release_types=ReleaseType.album, year_range=year_range, primary_genres=[self])
+            return get_chart(type=type, release_types=ReleaseType.album, year_range=year_range, primary_genres=[self])
 
 
     def _fetch_name(self):
@@ -244,43 +329,46 @@ class Genre:
     def __repr__(self):
         return f"Genre: {self.name}"
         
-class Artist:
-    @sleep_and_retry
-    @limits(calls=CALL_LIMIT, period=RATE_LIMIT)
-    def __init__(self, *, url=None, name=None, same_name_artist_number=0) -> None:
+class Artist(Entity):
+    _kind = "artist"
+    _fast_extractors = True
+    name = LazyField("_fetch_name")
+    localized_name = LazyField("_fetch_localized")
+    _info = LazyField("_fetch_info")
+    _start_date_location = LazyField("_fetch_start_date_location")
+    start_date = LazyField("_fetch_start_date")
+    start_location = LazyField("_fetch_start_location")
+    current_location = LazyField("_fetch_current_location")
+    _end_date_location = LazyField("_fetch_end_date_location")
+    end_date = LazyField("_fetch_end_date")
+    end_location = LazyField("_fetch_end_location")
+    genres = LazyField("_fetch_genres")
+    members = LazyField("_fetch_members")
+    akas = LazyField("_fetch_akas")
+    member_of = LazyField("_fetch_member_of")
+    related_artists = LazyField("_fetch_related")
+    notes = LazyField("_fetch_notes")
+    discography = LazyField("_fetch_discography")
+    appears_on = LazyField("_fetch_appears_on")
+
+    def __init__(self, *, url=None, name=None, same_name_artist_number=0, eager=False, compact=None) -> None:
+        self._eager = eager
+        self._compact = compact
+        self._prepare(url=url, name=name, same_name_artist_number=same_name_artist_number)
+        self._fetch()
+
+    def _prepare(self, *, url=None, name=None, same_name_artist_number=0):
         if not url:
             if not name:
                 raise NoURL("No valid artist name or URL provided.")
             else:
                 url = ROOT_URL + "/artist/" + name.replace(" ", "-").lower()
-        self._cached_rym_response = requests.get(url, headers= HEADERS)
-        if self._cached_rym_response.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        if self._cached_rym_response.status_code != 200:
-            raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}")
-        self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
         self.url = url
-        self.name = self._fetch_name()
-        self.localized_name = self._fetch_localized()
-        #self.type = self._fetch_type()
-        self._start_date_location = self._fetch_start_date_location()
-        self.start_date = self._start_date_location['date']
-        self.start_location = self._start_date_location['location']
-        self.current_location = self._fetch_current_location()
-        self._end_date_location = self._fetch_end_date_location()
-        self.end_date = self._end_date_location['date']
-        self.end_location = self._end_date_location['location']
-        self.genres = self._fetch_genres()
-        self.members = self._fetch_members()
-        self.akas = self._fetch_akas()
-        self.member_of = self._fetch_member_of()
-        self.related_artists = self._fetch_related()
-        self.notes = self._fetch_notes()
-        self._credits = None
-        self.discography = self.ReleaseCollection(self)
-        self.appears_on = self.FeatureCollection(self)
         self.same_name_artist_number = same_name_artist_number
 
+    def _extract(self):
+        self._credits = None
+
     class GeneralCollection:
         def __init__(self, artist) -> None:
             self.artist = artist
@@ -303,42 +391,63 @@ class Artist:
             return self.unauthorized_releases
         
         def create_simple_release(self, release):
+            date_elem = release.find(class_="disco_subline")
+            artist_elem = release.find(class_="disco_sub_artist")
+            info_elem = release.find(class_="disco_info").contents[0]
+            average_elem = release.find(class_="disco_avg_rating")
+            return self._build_simple_release(title=info_elem["title"],
+                                              href=info_elem["href"],
+                                              date_text=date_elem.find("span")["title"] if date_elem else None,
+                                              sub_artist=(artist_elem.text, artist_elem["href"]) if artist_elem else None,
+                                              number_of_ratings=release.find(class_="disco_ratings").text,
+                                              number_of_reviews=release.find(class_="disco_reviews").text,
+                                              average_rating=average_elem.text if average_elem else None)
+
+        def _credited_collaboration(self):
+            # looked up on the whole page, so it is the same for every release
+            if not hasattr(self, "_collaboration"):
+                if parsing.fast_extraction_enabled():
+                    self._collaboration = parsing.fast_credited_collaboration(self.artist._tree)
+                elif collab_elem := self.artist._soup.find(class_="credited_name"):
+                    self._collaboration = (collab_elem.contents[0].text,
+                                           [(artist.text, artist["href"]) for artist in collab_elem.find_all(class_="disco_sub_artist")])
+                else:
+                    self._collaboration = None
+            return self._collaboration
+
+        def _build_simple_release(self, *, title, href, date_text, sub_artist, number_of_ratings, number_of_reviews, average_rating):
             date = None
-            if date_elem := release.find(class_="disco_subline"):
-                date_text = date_elem.find("span")["title"]
+            if date_text:
                 date_components_count = date_text.count(" ") + 1
                 date_formating = {1: "%Y",
                                 2: "%B %Y",
                                 3: "%d %B %Y"}
-                
-                if not date_text:
-                    date = None
-                else:
-                    date = datetime.strptime(date_text, date_formating[date_components_count])
+                date = datetime.strptime(date_text, date_formating[date_components_count])
 
             artist_name = self.artist.name
             artists = [self.artist]
-            if collab_elem := self.artist._soup.find(class_="credited_name"):
-                artist_name = collab_elem.contents[0].text
-                artists = [SimpleArtist(name=artist.text, url=ROOT_URL + artist["href"])
-                           if ROOT_URL + artist["href"] != self.artist.url else self.artist
-                           for artist in collab_elem.find_all(class_="disco_sub_artist")]
-            elif artist_elem := release.find(class_="disco_sub_artist"):
-                artist_name = artist_elem.text
-                artist_url = ROOT_URL + artist_elem["href"]
+            if collaboration := self._credited_collaboration():
+                artist_name = collaboration[0]
+                artists = [SimpleArtist(name=name, url=ROOT_URL + artist_href)
+                           if ROOT_URL + artist_href != self.artist.url else self.artist
+                           for name, artist_href in collaboration[1]]
+            elif sub_artist:
+                artist_name = sub_artist[0]
+                artist_url = ROOT_URL + sub_artist[1]
                 if artist_url != self.artist.url:
                     artists = [SimpleArtist(name=artist_name, url=artist_url)]
             
-            return SimpleRelease(name=release.find(class_="disco_info").contents[0]["title"],
+            return SimpleRelease(name=title,
                                  artist_name=artist_name,
                                  artists=artists,
-                                 url= ROOT_URL + release.find(class_="disco_info").contents[0]["href"],
+                                 url= ROOT_URL + href,
                                  release_date=date,
-                                 number_of_ratings=release.find(class_="disco_ratings").text or None,
-                                 number_of_reviews=release.find(class_="disco_reviews").text or None,
-                                 average_rating=(lambda x: float(x.text) if x and x.text else None)(release.find(class_="disco_avg_rating")))
+                                 number_of_ratings=number_of_ratings or None,
+                                 number_of_reviews=number_of_reviews or None,
+                                 average_rating=float(average_rating) if average_rating else None)
 
     class ReleaseCollection(GeneralCollection):
+        @profiled
         def initialize_attributes(self):
             self.albums = self._fetch_releases("s")
             self.live_albums = self._fetch_releases("l")
@@ -353,7 +462,13 @@ class Artist:
             self.additional_releases = self._fetch_releases("x")
             self.various_artists_compilations = self._fetch_releases("v")
 
+        @profiled
         def _fetch_releases(self, type_of_release):
+            if parsing.fast_extraction_enabled():
+                if (fast_releases := parsing.fast_discography(self.artist._tree, "disco_type_" + type_of_release)) is None:
+                    return None
+                return [self._build_simple_release(**release) for release in fast_releases]
+
             releases_elem = self.artist._soup.find(id="disco_type_" + type_of_release)
 
             if not releases_elem:
@@ -362,17 +477,22 @@ class Artist:
             return [self.create_simple_release(release) for release in releases_elem.find_all(class_="disco_release")]
         
     class FeatureCollection(GeneralCollection):
+        @profiled
         def initialize_attributes(self):
-            
-            releases_elem = self.artist._soup.find(id="disco_type_a")
+            if parsing.fast_extraction_enabled():
+                if (fast_releases := parsing.fast_features(self.artist._tree)) is None:
+                    return None
+                releases = [(self._build_simple_release(**release), release_type_init) for release, release_type_init in fast_releases]
+            else:
+                releases_elem = self.artist._soup.find(id="disco_type_a")
 
-            if not releases_elem:
-                return None
+                if not releases_elem:
+                    return None
+
+                releases = [(self.create_simple_release(release), release.find(class_="disco_subline").find(class_="subtext").text)
+                            for release in releases_elem.find_all(class_="disco_release")]
 
-            for release in releases_elem.find_all(class_="disco_release"):
-                release_object = self.create_simple_release(release)
-               
-                release_type_init = release.find(class_="disco_subline").find(class_="subtext").text
+            for release_object, release_type_init in releases:
                 release_type = release_type_init.split('•')[1].strip()
                 
                 match release_type:
@@ -457,6 +577,10 @@ class Artist:
         return Artist(name=self.name, same_name_artist_number=self.same_name_artist_number+1)
 
     def _fetch_name(self):
+        if parsing.fast_extraction_enabled():
+            if (name := parsing.fast_text(self._tree, "h1.artist_name_hdr")) is None:
+                raise ParseError("No artist name was found.")
+            return name
         try:
             return self._soup.find("h1", class_="artist_name_hdr").text
         except AttributeError:
@@ -477,10 +601,21 @@ class Artist:
             else:
                 return Location(country=location_list[0], url=location_elem["href"])
 
+    def _fetch_info(self):
+        # a single walk over the info headers, keyed by header text, keeping document order
+        info = dict()
+        for position, header in enumerate(self._soup.find_all("div", class_="info_hdr")):
+            if header.string not in info:
+                info[header.string] = (position, header.find_next_sibling())
+        return info
+
+    def _info_content(self, *titles):
+        if found := [self._info[title] for title in titles if title in self._info]:
+            return min(found, key=lambda entry: entry[0])[1]
+
     def _fetch_gen_date_location(self, *titles):
         for title in titles:
-            if (date_location_elem := self._soup.find("div", class_="info_hdr", string=title)):
-                date_location_info = date_location_elem.find_next_sibling()
+            if (date_location_info := self._info_content(*(title if isinstance(title, list) else [title]))):
                 location = self._fetch_location(date_location_info)
                 if date_location_info.contents[0].name != "a":
                     date_text = date_location_info.contents[0].strip()[:-1]
@@ -506,22 +641,31 @@ class Artist:
 
     def _fetch_end_date_location(self):
         return self._fetch_gen_date_location("Disbanded", ["Disbanded","Died"])
+
+    def _fetch_start_date(self):
+        return self._start_date_location['date']
+
+    def _fetch_start_location(self):
+        return self._start_date_location['location']
+
+    def _fetch_end_date(self):
+        return self._end_date_location['date']
+
+    def _fetch_end_location(self):
+        return self._end_date_location['location']
     
     def _fetch_current_location(self):
-        if (date_location_elem := self._soup.find("div", class_="info_hdr", string="Currently")):
-            date_location_info = date_location_elem.find_next_sibling()
+        if (date_location_info := self._info_content("Currently")):
             location = self._fetch_location(date_location_info)
             return location
 
 
     def _fetch_genres(self):
-        if genre_div := self._soup.find("div", class_="info_hdr", string="Genres"):
-            genres_elem = genre_div.find_next_sibling()
+        if genres_elem := self._info_content("Genres"):
             return [SimpleGenre(name=genre.lstrip()) for genre in genres_elem.text.split(",")]
 
     def _fetch_members(self):
-        if members_div := self._soup.find("div", class_="info_hdr", string="Members"):
-            members_elem = members_div.find_next_sibling()
+        if members_elem := self._info_content("Members"):
             members_elems_list = members_elem.contents[0].contents
             members_elems_urls = [member for member in members_elems_list if isinstance(member, bs4.Tag) and member.get("href")]
             members_elem_raw = members_elem.text
@@ -551,8 +695,7 @@ class Artist:
             return members
 
     def _fetch_akas(self):
-        if aka_div := self._soup.find("div", class_="info_hdr", string="Also Known As"):
-            aka_elem = aka_div.find_next_sibling()
+        if aka_elem := self._info_content("Also Known As"):
             akas_text = aka_elem.text.split(",")
             aka_elems_list = aka_elem.contents[0].contents
             aka_elems_urls = [aka for aka in aka_elems_list if isinstance(aka, bs4.Tag) and aka.get("href")]
@@ -570,8 +713,7 @@ class Artist:
             return akas
         
     def _fetch_member_of(self):
-        if member_of_div := self._soup.find("div", class_="info_hdr", string="Member of"):
-            member_of = member_of_div.find_next_sibling()
+        if member_of := self._info_content("Member of"):
             all_artists = member_of.text.split(", ")
             artist_elems = member_of.find_all("a")
             return [SimpleArtist(name=artist.text, url=ROOT_URL + artist["href"])
@@ -579,24 +721,26 @@ class Artist:
                                                    [artist.text for artist in artist_elems]]
         
     def _fetch_related(self):
-        if related_div := self._soup.find("div", class_="info_hdr", string="Related Artists"):
-            related_elem = related_div.find_next_sibling()
+        if related_elem := self._info_content("Related Artists"):
             artist_elems = related_elem.find_all("a")
             return [SimpleArtist(name=artist.text, url=artist["href"]) for artist in artist_elems]
         
     def _fetch_notes(self):
-        if notes_div := self._soup.find("div", class_="info_hdr", string="Notes"):
-            notes_elem = notes_div.find_next_sibling()
+        if notes_elem := self._info_content("Notes"):
             return notes_elem.text
 
+    def _fetch_discography(self):
+        return self.ReleaseCollection(self)
+
+    def _fetch_appears_on(self):
+        return self.FeatureCollection(self)
+
     def _fetch_credits(self):
         credits_url = (self.url + "/credits/").replace("//", "/")
-        credits_response = requests.get(credits_url, headers= HEADERS)
-        if self._cached_rym_response.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        if credits_response.status_code != 200:
-            raise RequestFailed(f"Credits request failed with status code {self._cached_rym_response.status_code}")
-        credits_soup = bs4.BeautifulSoup(credits_response.content, "html.parser")
+        credits_response = transport.get(credits_url, entity=type(self).__qualname__)
+        check_response(credits_response, "Credits request failed")
+        with stats.timer("parse", type(self).__qualname__):
+            credits_soup = parsing.make_soup(credits_response.content)
         credited_releases = credits_soup.find_all(class_="disco_release")
 
         def get_roles(elem):
@@ -615,6 +759,7 @@ class Artist:
         return f"Artist: {self.name}"
 
 class Track:
+    __slots__ = ("number", "title", "length", "credited_artists", "release", "simple_release")
     def __init__(self, *, number, title, length, credited_artists=None, release=None, simple_release=None) -> None:
         self.number = number
         self.title = title
@@ -626,20 +771,20 @@ class Track:
     def __eq__(self, other) -> bool:
         return self.number == other.number and self.release == other.release
 
-class Distributor:
-    @sleep_and_retry
-    @limits(calls=CALL_LIMIT, period=RATE_LIMIT)
-    def __init__(self, url) -> None:
+class Distributor(Entity):
+    _kind = "distributor"
+    name = LazyField("_fetch_name")
+    logo = LazyField("_fetch_logo")
+    profile = LazyField("_fetch_profile")
+
+    def __init__(self, url, eager=False, compact=None) -> None:
+        self._eager = eager
+        self._compact = compact
+        self._prepare(url)
+        self._fetch()
+
+    def _prepare(self, url):
         self.url = url
-        self._cached_rym_response = requests.get(url, headers= HEADERS)
-        if self._cached_rym_response.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        if self._cached_rym_response.status_code != 200:
-            raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}.")
-        self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
-        self.name = self._fetch_name()
-        self.logo = self._fetch_logo()
-        self.profile = self._fetch_profile()
 
     def _fetch_name(self):
         return self._soup.find(id="wiki_content").find(class_="bubble_header").contents[0].text
@@ -659,28 +804,33 @@ class Distributor:
             else:
                 profile_text = curr_elem.text if curr_elem.name != "br" else "\n"
 
-class Label:
-    @sleep_and_retry
-    @limits(calls=CALL_LIMIT, period=RATE_LIMIT)
-    def __init__(self, url) -> None:
+class Label(Entity):
+    _kind = "label"
+    # chart reads _chart_url, which a label loaded from data has no page to find in
+    _serialized_private = Entity._serialized_private + ("_chart_url",)
+    name = LazyField("_fetch_name")
+    logo = LazyField("_fetch_logo")
+    genres = LazyField("_fetch_genres")
+    number_of_releases = LazyField("_fetch_no_releases")
+    founder = LazyField("_fetch_founder")
+    start_date = LazyField("_fetch_start_date")
+    start_location = LazyField("_fetch_start_location")
+    links = LazyField("_fetch_links")
+    address = LazyField("_fetch_address")
+    distributors = LazyField("_fetch_distributors")
+    notes = LazyField("_fetch_notes")
+    _chart_url = LazyField("_fetch_chart_url")
+
+    def __init__(self, url, eager=False, compact=None) -> None:
+        self._eager = eager
+        self._compact = compact
+        self._prepare(url)
+        self._fetch()
+
+    def _prepare(self, url):
         self.url = url
-        self._cached_rym_response = requests.get(url, headers= HEADERS)
-        if self._cached_rym_response.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        if self._cached_rym_response.status_code != 200:
-            raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}.")
-        self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
-        self.name = self._fetch_name()
-        self.logo = self._fetch_logo()
-        self.genres = self._fetch_genres()
-        self.number_of_releases = self._fetch_no_releases()
-        self.founder = self._fetch_founder()
-        self.start_date = self._fetch_start_date()
-        self.start_location = self._fetch_start_location()
-        self.links = self._fetch_links()
-        self.address = self._fetch_address()
-        self.distributors = self._fetch_distributors()
-        self.notes = self._fetch_notes()
+
+    def _extract(self):
         self._chart = None
     
     @property
@@ -699,7 +849,7 @@ class Label:
         return self._soup.find("picture").find_all("img")[-1]["src"]
     
     def _fetch_genres(self):
-        genre_list = [genre.strip() for genre in self._soup.find(class_="page_company_music_genres").split(", ")]
+        genre_list = [genre.strip() for genre in self._soup.find(class_="page_company_music_genres").text.split(", ")]
         return [SimpleGenre(name=genre) for genre in genre_list]
     
     def _fetch_no_releases(self):
@@ -756,57 +906,67 @@ class Label:
             return notes_elem.find_next_sibling().text
         
     def _fetch_chart(self):
+        if url := self._chart_url:
+            url = Chart._first_page_url(url)
+            return identity_map.get_or_create(Chart, url, lambda: Chart.from_url(url, compact=self._compact))
+
+    def _fetch_chart_url(self):
         outer_elem = self._soup.find(class_="page_section_charts link_only")
         if outer_elem:
-            return Chart(ROOT_URL + outer_elem.find("a")["href"])
+            return ROOT_URL + outer_elem.find("a")["href"]
         
         outer_elem = self._soup.find(class_="page_section_charts_header")
         if outer_elem:
-            return Chart(ROOT_URL + outer_elem.find("a")["href"])
-
-class Release:
-    @sleep_and_retry
-    @limits(calls=CALL_LIMIT, period=RATE_LIMIT)
-    def __init__(self, url) -> None:
-        self._cached_rym_response = requests.get(url, headers= HEADERS)
-        if self._cached_rym_response.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        if self._cached_rym_response.status_code != 200:
-            raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}")
-        self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
+            return ROOT_URL + outer_elem.find("a")["href"]
+
+class Release(Entity):
+    _kind = "release"
+    _fast_extractors = True
+    title = LazyField("_fetch_title")
+    artists = LazyField("_fetch_artists")
+    various_artists = LazyField("_fetch_various_artists")
+    artist_name = LazyField("_fetch_artist_name")
+    average_rating = LazyField("_fetch_average_rating")
+    number_of_ratings = LazyField("_fetch_number_of_ratings")
+    number_of_reviews = LazyField("_fetch_number_of_reviews")
+    release_date = LazyField("_fetch_release_date")
+    recording_date = LazyField("_fetch_recording_date")
+    type = LazyField("_fetch_type")
+    primary_genres = LazyField("_fetch_primary_genres")
+    secondary_genres = LazyField("_fetch_secondary_genres")
+    descriptors = LazyField("_fetch_descriptors")
+    languages = LazyField("_fetch_languages")
+    cover_url = LazyField("_fetch_cover_url")
+    links = LazyField("_fetch_release_links")
+    _info = LazyField("_fetch_info")
+    tracklist = LazyField("_fetch_linked_tracklist")
+    _track_positions = LazyField("_fetch_track_positions")
+    _track_titles = LazyField("_fetch_track_titles")
+    length = LazyField("_fetch_length")
+    credited_artists = LazyField("_fetch_linked_credited_artists")
+    issues = LazyField("_fetch_issues")
+    id = LazyField("_fetch_id")
+    is_nazi = LazyField("_fetch_is_nazi")
+    year_position = LazyField("_fetch_year_position")
+    overall_position = LazyField("_fetch_overall_position")
+    is_bolded = LazyField("_fetch_is_bolded")
+    rating_distribution = LazyField("_fetch_rating_distribution")
+
+    def __init__(self, url, eager=False, compact=None) -> None:
+        self._eager = eager
+        self._compact = compact
+        self._prepare(url)
+        self._fetch()
+
+    def _prepare(self, url):
         self.url = url
-        self.title = self._fetch_title()
-        self.artists = self._fetch_artists()
-        self.artist_name = self._fetch_artist_name()
-        self.average_rating = self._fetch_average_rating()
-        self.number_of_ratings = self._fetch_number_of_ratings()
-        self.number_of_reviews = self._fetch_number_of_reviews()
-        self.release_date = self._fetch_release_date()
-        self.recording_date = self._fetch_recording_date()
-        self.type = self._fetch_type()
-        self.primary_genres = self._fetch_primary_genres()
-        self.secondary_genres = self._fetch_secondary_genres()
-        self.descriptors = self._fetch_descriptors()
-        self.languages = self._fetch_languages()
-        self.cover_url = self._fetch_cover_url()
-        self.links = self._fetch_release_links()
-        self.tracklist = self._fetch_tracks()
-        self.length = self._fetch_length()
-        self.credited_artists = self._fetch_credited_artists()
-        self.issues = self._fetch_issues()
-        self.__update_tracks()
+
+    def _extract(self):
         self._reviews = None
         self._lists = None
-        self.id = self._fetch_id()
-        self.is_nazi = self._fetch_is_nazi()
-        self.year_position = self._fetch_year_position()
-        self.overall_position = None
-        self.is_bolded = self._fetch_is_bolded()
-        self.rating_distribution = self._fetch_rating_distribution()
 
     class Lists(EntryCollection):
-        def __init__(self, url):
-            super().__init__(url, "navlinknum")
+        _pages_class = "navlinknum"
             
         def _specific_fetch(self):
             lists_elem = self._soup.find("ul", class_="lists expanded").contents
@@ -816,8 +976,7 @@ class Release:
                 ) for entry in lists_elem[1::2]]
         
     class Reviews(EntryCollection):
-        def __init__(self, url):
-            super().__init__(url, "navlinknum")
+        _pages_class = "navlinknum"
 
         def _specific_fetch(self):
             curr_elem = self._soup.find(class_="review_list")
@@ -862,14 +1021,20 @@ class Release:
         return self._reviews
 
     def get_track_by_title(self, title):
-        for track in self.tracklist:
-            if track.title == title:
-                return track
+        return self._track_titles.get(title)
             
     def get_track_by_number(self, number):
-        for track in self.tracklist:
-            if track.number == number:
-                return track
+        position = self._track_positions.get(number)
+        if position is not None:
+            return self.tracklist[position]
+
+    def get_tracks_in_range(self, start, stop):
+        # tracks from the first one numbered start up to, not including, the first one numbered stop
+        start_position = self._track_positions.get(start)
+        if start_position is None:
+            return list()
+        stop_position = self._track_positions.get(stop, len(self.tracklist))
+        return self.tracklist[start_position:stop_position]
 
     def _fetch_title(self):
         try:
@@ -887,6 +1052,9 @@ class Release:
         artists_elem = outer_elem.find_all("a", class_="artist")
         return [SimpleArtist(name=artist.text, url=ROOT_URL+artist["href"]) for artist in artists_elem]
     
+    def _fetch_various_artists(self):
+        return "/comp/various-artists/" in self.url
+
     def _fetch_artist_name(self):
         outer_elem = self._soup.find("span", {"itemprop":"byArtist"})
         if collab_name := outer_elem.find(class_="credited_name"):
@@ -908,9 +1076,17 @@ class Release:
             if len(reviews_elem_split) > 1:
                 return int(reviews_elem_split[0].replace(",","") if reviews_elem_split[0].replace(",","") != '' else 0)
             
+    def _fetch_info(self):
+        # a single walk over the info table; html.parser nests the value cell inside the
+        # unclosed header cell, other builders make it a sibling, find_next covers both
+        info = dict()
+        for header in self._soup.find_all("th", class_="info_row"):
+            if (title := next(header.strings, "").strip()) and title not in info:
+                info[title] = header.find_next("td")
+        return info
+
     def _gen_fetch_date(self, title):
-        if (recorded_elem := self._soup.find(class_="info_hdr", string=title)):
-            dates_info = recorded_elem.find_next_sibling()
+        if dates_info := self._info.get(title):
             return dates_info.text
     
     def _fetch_release_date(self):
@@ -925,14 +1101,23 @@ class Release:
         return None
         
     def _fetch_recording_date(self):
-        if proto_date := re.findall(r'Recorded<td colspan="2">(.{1,17})<\/td>',str(self._soup)):
-            return proto_date[0]
-        else:
+        if (recorded_elem := self._info.get("Recorded")) is None:
+            # info tables without th.info_row headers, read the way it was before _info
+            if proto_date := re.findall(r'Recorded<td colspan="2">(.{1,17})<\/td>', str(self._soup)):
+                return proto_date[0]
             return None
+        if recorded_elem.get("colspan") == "2":
+            if proto_date := re.fullmatch(r".{1,17}", recorded_elem.decode_contents()):
+                return proto_date.group()
+        return None
             
     def _fetch_type(self):
-        if types_proto := re.findall(r"Type((?:\w+, )*\w+)", self._soup.text):
-            return types_proto[0]
+        if (type_elem := self._info.get("Type")) is None:
+            if types_proto := re.findall(r"Type((?:\w+, )*\w+)", self._soup.text):
+                return types_proto[0]
+            return None
+        if types_proto := re.match(r"(?:\w+, )*\w+", type_elem.text):
+            return types_proto.group()
 
     def _gen_fetch_genres(self, type):
         if genres_elem := self._soup.find("span", class_=f"release_{type}_genres"):
@@ -1001,7 +1186,15 @@ class Release:
                                 apple_music=release_links["applemusic"])
         return ReleaseLinks()
         
+    @profiled
     def _fetch_tracks(self):
+        if parsing.fast_extraction_enabled():
+            if (fast_tracks := parsing.fast_tracks(self._tree)) is None:
+                return None
+            return [Track(number=number, title=title, length=timedelta(seconds=seconds),
+                          simple_release=SimpleRelease(title=self.title, url=self.url))
+                    for number, title, seconds in fast_tracks]
+
         tracks_elem = self._soup.find(id="tracks")
         if not tracks_elem:
             return None
@@ -1017,6 +1210,7 @@ class Release:
         
         return tracks
     
+    @profiled
     def _fetch_credited_artists(self):
         def get_role_tracks(role_tracks_elem):
             if not role_tracks_elem:
@@ -1027,15 +1221,7 @@ class Release:
 
             for (result1, result2) in result_tuples:
                 if result1:
-                    start_stop_tracks = result1.split("-")
-                    start_flag = False
-                    for track in self.tracklist:
-                        if track.number == start_stop_tracks[1]:
-                            break
-                        if track.number == start_stop_tracks[0]:
-                            start_flag = True
-                        if start_flag:
-                            role_tracks.append(track)
+                    role_tracks.extend(self.get_tracks_in_range(*result1.split("-")))
                 elif result2:
                     role_tracks.append(self.get_track_by_number(result2))
 
@@ -1069,36 +1255,53 @@ class Release:
 
         return credited_artists
     
-    def __update_tracks(self):
-        new_credited_artists = list()
+    @profiled
+    def _link_credits(self):
+        # credits point at tracks and tracks back at credits, so both are resolved together
+        self.tracklist = self._fetch_tracks()
+        self.credited_artists = self._fetch_credited_artists()
+        self.__update_tracks()
 
-        for credited_artist in self.credited_artists:
-            new_roles = list()
+    def _fetch_linked_tracklist(self):
+        self._link_credits()
+        return self.tracklist
 
+    def _fetch_linked_credited_artists(self):
+        self._link_credits()
+        return self.credited_artists
+
+    @profiled
+    def __update_tracks(self):
+        # role tracks are taken from the tracklist itself, so linking them only
+        # needs the credit added to each track, never a search for it
+        for credited_artist in self.credited_artists:
             for role in credited_artist.roles:
+                if not role.tracks:
+                    continue
                 new_tracks = list()
-                
-                if role.tracks:
-                    for track in role.tracks:
-                        try:
-                            if self.tracklist and track in self.tracklist:
-                                if not track.credited_artists:
-                                    track.credited_artists = list()
-                                track.credited_artists.append(credited_artist)
-                                new_tracks.append(track)
-                                self.tracklist[self.tracklist.index(track)] = track
-                        except AttributeError:
-                            continue
-                    
-                    role.tracks = new_tracks
-                
-                new_roles.append(role)
 
-            credited_artist.roles = new_roles
-            new_credited_artists.append(credited_artist)
-        
-        self.credited_artists = new_credited_artists
+                for track in role.tracks:
+                    if track is None or not self.tracklist:
+                        continue
+                    if not track.credited_artists:
+                        track.credited_artists = list()
+                    track.credited_artists.append(credited_artist)
+                    new_tracks.append(track)
+
+                role.tracks = new_tracks
     
+    def _fetch_track_positions(self):
+        positions = dict()
+        for position, track in enumerate(self.tracklist or ()):
+            positions.setdefault(track.number, position)
+        return positions
+
+    def _fetch_track_titles(self):
+        titles = dict()
+        for track in self.tracklist or ():
+            titles.setdefault(track.title, track)
+        return titles
+
     def _fetch_length(self):
         release_length_elem = self._soup.find("span", class_="tracklist_total")
         
@@ -1202,11 +1405,13 @@ class Release:
         if year_text := self._soup.find(class_="page_section").find(string="Ranked"):
             return int(year_text.find_next_sibling().find("b").text.replace(",","").replace("#",""))
         
-    def _fetch_is_bolded(self):
+    def _fetch_overall_position(self):
         if overall_text := self._soup.find(class_="page_section").find("a", string="overall"):
-            overall_position = int(overall_text.find_previous_sibling("b").text.replace(",",""))
-            self.overall_position = overall_position
-            return overall_position <= 7500
+            return int(overall_text.find_previous_sibling("b").text.replace(",",""))
+
+    def _fetch_is_bolded(self):
+        if self.overall_position is not None:
+            return self.overall_position <= 7500
         return False
     
     def _fetch_rating_distribution(self):
@@ -1225,15 +1430,30 @@ class Release:
         return self.url == other.url or self.id == other.id
     
 class ReleaseIssue(Release):
-    def __init__(self, url) -> None:
-        super().__init__(url=url)
-        issue_elem = self._fetch_issue_elem()
-        issue_info = self._fetch_issue_info(issue_elem)
-        self.format = issue_info["format"]
-        self.label = issue_info["label"]
-        self.issue_number = issue_info["issue_number"]
-        self.attributes = issue_info["attributes"]
-        self.countries = issue_info["countries"]
+    _issue_info = LazyField("_fetch_own_issue_info")
+    format = LazyField("_fetch_format")
+    label = LazyField("_fetch_label")
+    issue_number = LazyField("_fetch_issue_number")
+    attributes = LazyField("_fetch_attributes")
+    countries = LazyField("_fetch_countries")
+
+    def _fetch_own_issue_info(self):
+        return self._fetch_issue_info(self._fetch_issue_elem())
+
+    def _fetch_format(self):
+        return self._issue_info["format"]
+
+    def _fetch_label(self):
+        return self._issue_info["label"]
+
+    def _fetch_issue_number(self):
+        return self._issue_info["issue_number"]
+
+    def _fetch_attributes(self):
+        return self._issue_info["attributes"]
+
+    def _fetch_countries(self):
+        return self._issue_info["countries"]
 
     def _fetch_issue_elem(self):
         issues_elems = self._soup.find_all(class_="issue_info")[1:]
@@ -1242,44 +1462,28 @@ class ReleaseIssue(Release):
             if (ROOT_URL + issue.find("a")["href"]) == self.url:
                 return issue
 
-class Rating:
-    def __init__(self, *, id=None, first_name="", last_name="", first_name_localized="", 
-                 last_name_localized="", title=None, release_year=None, rating=None, 
-                 ownership=None, purchase_date=None, media_type=None, review=None, url=None, release=None) -> None:
-        self.id = id
-        self.artist_name = (first_name + " " + last_name).strip()
-        self.artist_name_localized = (first_name_localized + " " + last_name_localized).strip()
-        self.title = title
-        self.release_year = release_year
-        self.rating = rating
-        self.ownership = ownership
-        self.purchase_date = purchase_date
-        self.media_type = media_type
-        self.review = review
-        self.url = url
-        self.release = release
+class User(Entity):
+    _kind = "user"
+    favorite_artists = LazyField("_fetch_favorite_artists")
+    other_comments = LazyField("_fetch_other_comments")
+    recently_online_friends = LazyField("_fetch_recently_online_friends")
+    recent_ratings = LazyField("_fetch_recent_ratings")
 
-    def __eq__(self, other) -> bool:
-        return self.id == other.id or (self.url and len(self.url) and self.url == other.url)
+    def __init__(self, *, username=None, url=None, eager=False, compact=None) -> None:
+        self._eager = eager
+        self._compact = compact
+        self._prepare(username=username, url=url)
+        self._fetch()
 
-class User:
-    def __init__(self, *, username=None, url=None) -> None:
+    def _prepare(self, *, username=None, url=None):
         self.username = username or re.search(r"[\w+|_]+$", url).group()
         if not self.username:
             raise NoURL("No valid username or URL provided.")
         self.url = url or f"{ROOT_URL}/~{username}"
-        self._cached_rym_response = requests.get(self.url, headers= HEADERS)
-        if self._cached_rym_response.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        if self._cached_rym_response.status_code != 200:
-            raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}")
-        self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
-        self.favorite_artists = self._fetch_favorite_artists()
-        self.other_comments = self._fetch_other_comments()
-        self.recently_online_friends = self._fetch_recently_online_friends()
+
+    def _extract(self):
         self._friends = None
-        self.recent_ratings = self._fetch_recent_ratings()
-        self.ratings = list()
+        self.ratings = RatingIndex()
 
     @property
     def favourite_artists(self):
@@ -1293,44 +1497,23 @@ class User:
 
     def add_rating(self, rating):
             if not self.ratings:
-                self.ratings = list()
-            if rating not in self.ratings:
+                self.ratings = RatingIndex()
+            if (position := self.ratings.find(rating)) is None:
                 self.ratings.append(rating)
             else:
-                old_rating = self.ratings[self.ratings.index(rating)]
+                old_rating = self.ratings[position]
                 old_rating.rating = rating.rating
                 old_rating.release = rating.release
-                self.ratings[self.ratings.index(rating)] = old_rating
 
     def import_ratings(self, *, url=None, filename=None, replace=False):
-        if filename:
-            with open(filename, 'r', encoding="utf-8") as file:
-                ratings_proto = list(csv.DictReader(file))
-        elif url:
-            response = requests.get(url)
-            if response.status_code != 200:
-                raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}")
-            ratings_proto = list(csv.DictReader(response.text.splitlines()))
-        else:
-            raise NoURL("Provide a filename or an URL.")
-        ratings = [Rating(
-                    id=row["RYM Album"],
-                    first_name=row[" First Name"],
-                    last_name=row["Last Name"],
-                    first_name_localized=row["First Name localized"],
-                    last_name_localized=row[" Last Name localized"],
-                    title=row["Title"],
-                    release_year=int(row["Release_Date"]) if row["Release_Date"] else None,
-                    rating=int(row["Rating"])/2 if row["Rating"] != "" else None,
-                    ownership=row["Ownership"],
-                    purchase_date=row["Purchase Date"],
-                    media_type=row["Media Type"],
-                    review=row.get(" Review")
-                ) for row in ratings_proto]
+        ratings = iter_ratings(filename=filename, url=url)
         if replace:
-            self.ratings = list()
+            self.ratings = RatingIndex()
         for rating in ratings:
             self.add_rating(rating)
+
+    def ratings_table(self):
+        return RatingsTable.from_ratings(self.ratings or ())
     
     def _fetch_favorite_artists(self):
         title_elem = self._soup.find(class_="bubble_header", string="favorite artists")
@@ -1348,10 +1531,10 @@ class User:
     
     def _fetch_friends(self):
         friends_url = self.url.replace("~", "friends/")
-        friends_request = requests.get(friends_url, headers= HEADERS)
-        if friends_request.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        friends_soup = bs4.BeautifulSoup(friends_request.content, "html.parser")
+        friends_request = transport.get(friends_url, entity=type(self).__qualname__)
+        check_response(friends_request, "Friends request failed")
+        with stats.timer("parse", type(self).__qualname__):
+            friends_soup = parsing.make_soup(friends_request.content)
         friends_elem = friends_soup.find_all(class_="or_card_frame_inner")
         if friends_elem:
             return [SimpleUser(username= friend.text.replace("\n   \n","")) for friend in friends_elem]
@@ -1372,64 +1555,62 @@ class User:
                               url= ROOT_URL+release.find(class_="album")["href"]) for release in recent_ratings_elem]
         
 class RYMList(EntryCollection):
-    def __init__(self, url) -> None:
-        self.init_url = url
-        self.current_url = self.init_url
-        self._cached_rym_response = requests.get(self.init_url, headers= HEADERS)
-        if self._cached_rym_response.status_code == 503:
-            raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-        if self._cached_rym_response.status_code != 200:
-            raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}")
-        self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
-        self.author = self._fetch_author()
-        self.content = self._fetch_entries()
-        self.current_page = 1
-        if not self._soup.find("a", class_="navlinknext"):
-            raise NoContent("The requested chart has no entries.")
-        self.content = self._fetch_entries(init=True)
-        self._id = self._fetch_id()
-        
-    def _fetch_entries(self, init=False):
-        # no clue how to get around with this yet
-        '''if not init:
-            self._cached_rym_response = requests.get(self.current_url, headers= HEADERS)
-            if self._cached_rym_response.status_code != 200:
-                raise RequestFailed(f"Loading next page failed with status code {self._cached_rym_response.status_code}.")
-            self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
-        
+    _pages_class = "navlinknum"
+    author = LazyField("_fetch_author")
+    _id = LazyField("_fetch_id")
+
+    def __init__(self, url, compact=None) -> None:
+        self._compact = compact
+        self._prepare(url)
+        self._fetch()
+
+    def _extract(self):
         if not self._soup.find("a", class_="navlinknext"):
-            raise NoContent("No more pages to be loaded.")
+            raise NoContent("The requested list has no entries.")
+        super()._extract()
+
+    @property
+    def content(self):
+        return [entry for entries in self.entries for entry in entries]
+
+    def _fetch_author(self):
+        if author_elem := self._soup.find(class_="user"):
+            return SimpleUser(username=author_elem.text)
+
+    def _fetch_id(self):
+        if id_elem := self._soup.find("input", class_="list_shortcut"):
+            return ''.join(re.findall(r'\d+', id_elem["value"]))
 
-        list_elem = self._soup.find("table", {"id":"user_list").contents
+    def _specific_fetch(self):
+        # no clue how to get around with this yet
+        '''list_elem = self._soup.find("table", {"id":"user_list").contents
         entries = [SimpleRYMList() for entry in list_elem[:-1:2]]
         
         return entries'''
-
-    def load_more_entries(self):
-        self.current_page += 1
-        self.current_url = re.sub(r"\d+\/$", f"{self.current_page}/", self.current_url)
-        self.content += self._fetch_entries()
-        return self
+        return list()
     
-class Review:
-    def __init__(self, *, url, author=None, content=None, rating=None, release:Release=None, date=None, request_needed=True) -> None:
+class Review(Entity):
+    _kind = "review"
+
+    def __init__(self, *, url, author=None, content=None, rating=None, release:Release=None, date=None, request_needed=True, compact=None) -> None:
+        self._compact = compact
+        self._prepare(url=url, author=author, content=content, rating=rating, release=release, date=date)
+        if request_needed:
+            self._fetch()
+
+    def _prepare(self, *, url, author=None, content=None, rating=None, release:Release=None, date=None):
         self.url = url
         self.content = content
         self.rating = rating
         self.author = author
         self.date = date
         self.release = release
-        if request_needed:
-            self._cached_rym_response = requests.get(url, headers= HEADERS)
-            if self._cached_rym_response.status_code == 503:
-                raise RateLimit("You're rate limited from RateYourMusic. I suggest opening the website in a browser, solving the CAPTCHA and waiting 15 minutes before creating a new object.")
-            if self._cached_rym_response.status_code != 200:
-                raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}")
-            self._soup = bs4.BeautifulSoup(self._cached_rym_response.content, "html.parser")
-            self.content = content or self._fetch_content()
-            self.rating = rating or self._fetch_rating()
-            self.author = author or self._fetch_author()
-            self.simplified_releade = SimpleRelease(title= self._fetch_release_title(), url= self._fetch_release_url())
+
+    def _extract(self):
+        self.content = self.content or self._fetch_content()
+        self.rating = self.rating or self._fetch_rating()
+        self.author = self.author or self._fetch_author()
+        self.simplified_releade = SimpleRelease(title= self._fetch_release_title(), url= self._fetch_release_url())
 
     def _fetch_content(self):
         if review_elem := self._soup.find(class_="page_review_feature_body_inner"):
@@ -1460,6 +1641,7 @@ class Review:
         return float(rating_elem["content"])
 
 class Location:
+    __slots__ = ("city", "state", "country", "url")
     def __init__(self, *, city=None, state=None, country, url) -> None:
         self.city = city
         self.state = state
@@ -1481,6 +1663,7 @@ class Location:
         return self._get_representation("Location: ")
     
 class ReleaseLinks:
+    __slots__ = ("spotify", "youtube", "bandcamp", "soundcloud", "apple_music")
     def __init__(self, *, spotify=None, youtube=None, bandcamp=None, soundcloud=None, apple_music=None):
         self.spotify = spotify
         self.youtube = youtube
@@ -1489,6 +1672,7 @@ class ReleaseLinks:
         self.apple_music = apple_music
 
 class Role:
+    __slots__ = ("name", "tracks", "credited_artist")
     def __init__(self, *, name, tracks=None, credited_artist= None) -> None:
         self.name = name
         self.tracks = tracks
@@ -1507,17 +1691,21 @@ class Role:
             return self.name
 
 class SimpleGenre(SimpleEntity):
+    __slots__ = ()
     def get_genre(self):
-        return Genre(self.url, self.name)
+        url = self.url or f"{ROOT_URL}/genre/{self.name.replace(' ', '-').lower()}/"
+        return identity_map.get_or_create(Genre, url, lambda: Genre(url=self.url, name=self.name))
 
 class SimpleArtist(SimpleEntity):
+    __slots__ = ()
     def get_artist(self):
         if self.url:
-            return Artist(self.url)
+            return identity_map.get_or_create(Artist, self.url, lambda: Artist(url=self.url))
         else:
             raise NoURL("No URL is associated with this artist.")
 
 class SimpleRelease(SimpleEntity):
+    __slots__ = ("artist_name", "artists", "release_date", "average_rating", "number_of_ratings", "number_of_reviews", "cover", "is_bolded")
     def __init__(self, *, title=None, name=None, release_date=None, average_rating=None, number_of_ratings=None, number_of_reviews=None, url=None, cover=None, artist_name=None, artists=None, bolded=None):
         super().__init__(name=name or title, url=url)
         self.artist_name = artist_name
@@ -1530,9 +1718,10 @@ class SimpleRelease(SimpleEntity):
         self.is_bolded = bolded
 
     def get_release(self):
-        return Release(self.url)
+        return identity_map.get_or_create(Release, self.url, lambda: Release(self.url))
     
 class SimpleRYMList(SimpleEntity):
+    __slots__ = ("author",)
     def __init__(self, *, name=None, title=None, url=None, author=None) -> None:
         super().__init__(name=name, title=title, url=url)
         self.author = author
@@ -1541,57 +1730,38 @@ class SimpleRYMList(SimpleEntity):
         return RYMList(self.url)
     
 class SimpleUser(SimpleEntity):
+    __slots__ = ("ratings",)
     def __init__(self, *, username=None, url=None, ratings=None) -> None:
         super().__init__(name=username, url=url)
-        self.ratings = ratings
+        self.ratings = RatingIndex(ratings) if ratings is not None else None
 
     def import_ratings(self, *, url=None, filename=None, replace=False):
-        if filename:
-            with open(filename, 'r', encoding="utf-8") as file:
-                ratings_proto = list(csv.DictReader(file))
-        elif url:
-            response = requests.get(url)
-            if response.status_code != 200:
-                raise RequestFailed(f"Initial request failed with status code {self._cached_rym_response.status_code}")
-            ratings_proto = list(csv.DictReader(response.text.splitlines()))
-        else:
-            raise NoURL("Provide a filename or an URL.")
-        
-        ratings = [Rating(
-                    id=row["RYM Album"],
-                    first_name=row[" First Name"],
-                    last_name=row["Last Name"],
-                    first_name_localized=row["First Name localized"],
-                    last_name_localized=row[" Last Name localized"],
-                    title=row["Title"],
-                    release_year=int(row["Release_Date"]) if row["Release_Date"] else None,
-                    rating=int(row["Rating"])/2 if row["Rating"] != "" else None,
-                    ownership=row["Ownership"],
-                    purchase_date=row["Purchase Date"],
-                    media_type=row["Media Type"],
-                    review=row.get(" Review")
-                ) for row in ratings_proto]
-
+        ratings = iter_ratings(filename=filename, url=url)
         if replace:
-            self.ratings = list()
-        
+            self.ratings = RatingIndex()
         for rating in ratings:
             self.add_rating(rating)
 
+    def ratings_table(self):
+        return RatingsTable.from_ratings(self.ratings or ())
+
     def add_rating(self, rating):
             if not self.ratings:
-                self.ratings = list()
-            if rating not in self.ratings:
+                self.ratings = RatingIndex()
+            if (position := self.ratings.find(rating)) is None:
                 self.ratings.append(rating)
+                return
             if rating.release:
-                self.ratings[self.ratings.index(rating)] = rating
+                self.ratings[position] = rating
                 
-            self.ratings[self.ratings.index(rating)].rating = rating.rating
+            self.ratings[position].rating = rating.rating
 
     def get_user(self):
-        return User(username=self.name, url=self.url)
+        url = self.url or f"{ROOT_URL}/~{self.name}"
+        return identity_map.get_or_create(User, url, lambda: User(username=self.name, url=self.url))
     
 class SimpleReleaseIssue(SimpleEntity):
+    __slots__ = ("format", "release_date", "label", "issue_number", "attributes", "countries")
     def __init__(self, *, title, url, format, release_date, label=None, issue_number=None, attributes=None, countries=None) -> None:
         super().__init__(title= title, url=url)
         self.format = format
@@ -1602,27 +1772,31 @@ class SimpleReleaseIssue(SimpleEntity):
         self.countries = countries
 
     def get_release_issue(self):
-        return ReleaseIssue(self.url)
+        return identity_map.get_or_create(ReleaseIssue, self.url, lambda: ReleaseIssue(self.url))
     
 class SimpleLabel(SimpleEntity):
+    __slots__ = ()
     def get_label(self):
-        return Label(self.url)
+        return identity_map.get_or_create(Label, self.url, lambda: Label(self.url))
     
 class SimpleDistributor(SimpleEntity):
+    __slots__ = ("years",)
     def __init__(self, *, name=None, title=None, url=None, years=None) -> None:
         super().__init__(name=name, title=title, url=url)
         if years:
             self.years = years
 
     def get_distributor(self):
-        return Distributor(self.url)
+        return identity_map.get_or_create(Distributor, self.url, lambda: Distributor(self.url))
     
 class LabelDistributor(SimpleLabel):
+    __slots__ = ("years",)
     def __init__(self, *, name=None, title=None, url=None, years=None) -> None:
         super().__init__(name=name, title=title, url=url)
         self.years = years
 
 class BandMember(SimpleArtist):
+    __slots__ = ("instruments", "years_active", "aka")
     def __init__(self, *, name, instruments, years_active, aka, url=None):
         super().__init__(name=name, url=url)
         self.instruments = instruments
@@ -1630,10 +1804,12 @@ class BandMember(SimpleArtist):
         self.aka = aka
 
 class CreditedArtist(SimpleArtist):
+    __slots__ = ("roles",)
     def __init__(self, *, name, url=None, roles):
         super().__init__(name=name, url=url)
         self.roles = roles
 
 class CreditedRelease(CreditedArtist):
+    __slots__ = ()
     def get_release(self):
-        return Release(self.url)
\ No newline at end of file
+        return identity_map.get_or_create(Release, self.url, lambda: Release(self.url))
\ No newline at end of file
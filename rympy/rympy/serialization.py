@@ -0,0 +1,139 @@
+import json
+from datetime import date, datetime, timedelta
+from .rym import *
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# every class that can be written out, by qualified name
+SERIALIZABLE_CLASSES = {cls.__qualname__: cls for cls in (
+    Genre, Artist, Artist.ReleaseCollection, Artist.FeatureCollection, Distributor, Label, Release, ReleaseIssue, User,
+    Track, Role, Location, ReleaseLinks, Rating,
+    SimpleEntity, SimpleGenre, SimpleArtist, SimpleRelease, SimpleRYMList, SimpleUser, SimpleReleaseIssue,
+    SimpleLabel, SimpleDistributor, LabelDistributor, BandMember, CreditedArtist, CreditedRelease
+)}
+
+_PAGE_ATTRIBUTES = ("_soup", "_tree", "_cached_rym_response")
+
+def to_dict(obj):
+    # objects reached more than once (tracks and their credits, an artist and its
+    # discography) are written once and referred to by id afterwards
+    return _Encoder().encode(obj)
+
+def from_dict(data, into=None):
+    # into: an existing object of the serialized type to fill instead of a new one
+    return _Decoder(into).decode(data)
+
+# first byte of dumps() output, naming the codec, so that data written with or
+# without msgpack installed reads back either way
+_JSON_TAG = b"J"
+_MSGPACK_TAG = b"M"
+
+def dumps(obj):
+    if msgpack:
+        return _MSGPACK_TAG + msgpack.packb(to_dict(obj), use_bin_type=True)
+    return _JSON_TAG + json.dumps(to_dict(obj), separators=(",", ":")).encode("utf-8")
+
+def loads(data, into=None):
+    tag, payload = data[:1], data[1:]
+    if tag not in (_JSON_TAG, _MSGPACK_TAG):
+        # untagged data from before the tag: a JSON object or a msgpack map
+        tag, payload = (_JSON_TAG if data[:1] == b"{" else _MSGPACK_TAG), data
+    if tag == _JSON_TAG:
+        return from_dict(json.loads(payload), into)
+    if msgpack is None:
+        raise ImportError("This data was written with msgpack, which is not installed.")
+    return from_dict(msgpack.unpackb(payload, raw=False, strict_map_key=False), into)
+
+def _object_state(obj):
+    if isinstance(obj, Entity):
+        if getattr(obj, "_soup", None) is not None:
+            obj._evaluate_fields()
+        return {name: value for name, value in vars(obj).items()
+                if not name.startswith("_") or name in obj._serialized_private}
+    if hasattr(obj, "__dict__"):
+        return {name: value for name, value in vars(obj).items() if not name.startswith("_")}
+    return {name: getattr(obj, name) for klass in type(obj).__mro__ for name in getattr(klass, "__slots__", ())
+            if hasattr(obj, name)}
+
+class _Encoder:
+    def __init__(self) -> None:
+        self._ids = dict()
+
+    def encode(self, value):
+        if value is None or isinstance(value, (bool, int, float, str, bytes)):
+            return value
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if isinstance(value, tuple):
+            return {"__type__": "tuple", "items": [self.encode(item) for item in value]}
+        if isinstance(value, dict):
+            if all(isinstance(key, str) for key in value) and "__type__" not in value and "__ref__" not in value:
+                return {key: self.encode(item) for key, item in value.items()}
+            return {"__type__": "dict", "items": [[self.encode(key), self.encode(item)] for key, item in value.items()]}
+        if isinstance(value, datetime):
+            return {"__type__": "datetime", "value": value.isoformat()}
+        if isinstance(value, date):
+            return {"__type__": "date", "value": value.isoformat()}
+        if isinstance(value, timedelta):
+            return {"__type__": "timedelta", "value": value.total_seconds()}
+        if isinstance(value, RatingIndex):
+            return {"__type__": "RatingIndex", "items": [self.encode(rating) for rating in value]}
+
+        type_name = type(value).__qualname__
+        if SERIALIZABLE_CLASSES.get(type_name) is not type(value):
+            raise TypeError(f"Objects of type {type_name} can't be serialized.")
+        if id(value) in self._ids:
+            return {"__ref__": self._ids[id(value)]}
+        self._ids[id(value)] = object_id = len(self._ids)
+        return {"__type__": type_name, "__id__": object_id,
+                "state": {name: self.encode(item) for name, item in _object_state(value).items()}}
+
+class _Decoder:
+    def __init__(self, into=None) -> None:
+        self._objects = dict()
+        self._into = into
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if "__ref__" in value:
+            return self._objects[value["__ref__"]]
+
+        match value.get("__type__"):
+            case None:
+                return {key: self.decode(item) for key, item in value.items()}
+            case "tuple":
+                return tuple(self.decode(item) for item in value["items"])
+            case "dict":
+                return {self.decode(key): self.decode(item) for key, item in value["items"]}
+            case "datetime":
+                return datetime.fromisoformat(value["value"])
+            case "date":
+                return date.fromisoformat(value["value"])
+            case "timedelta":
+                return timedelta(seconds=value["value"])
+            case "RatingIndex":
+                return RatingIndex(self.decode(item) for item in value["items"])
+
+        if (cls := SERIALIZABLE_CLASSES.get(value["__type__"])) is None:
+            raise ValueError(f"Unknown serialized type {value['__type__']}.")
+        if self._into is not None:
+            if type(self._into) is not cls:
+                raise TypeError(f"Can't load a serialized {value['__type__']} into a {type(self._into).__qualname__}.")
+            obj, self._into = self._into, None
+        else:
+            obj = cls.__new__(cls)
+        self._objects[value["__id__"]] = obj
+        if isinstance(obj, Entity):
+            # an entity rebuilt from data has no page behind it
+            for name in _PAGE_ATTRIBUTES:
+                setattr(obj, name, None)
+            obj._extract()
+        for name, item in value["state"].items():
+            setattr(obj, name, self.decode(item))
+        return obj
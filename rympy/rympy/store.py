@@ -0,0 +1,300 @@
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from .serialization import *
+from .transport import canonical_url
+from . import base_classes
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS entities (
+           url TEXT PRIMARY KEY,
+           type TEXT NOT NULL,
+           kind TEXT NOT NULL,
+           rym_id TEXT,
+           data BLOB NOT NULL,
+           stored_at REAL NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS entities_rym_id ON entities (kind, rym_id)",
+    """CREATE TABLE IF NOT EXISTS releases (
+           url TEXT PRIMARY KEY,
+           rym_id TEXT,
+           title TEXT,
+           artist_name TEXT,
+           type TEXT,
+           release_date TEXT,
+           average_rating REAL,
+           number_of_ratings INTEGER,
+           number_of_reviews INTEGER)""",
+    "CREATE INDEX IF NOT EXISTS releases_rym_id ON releases (rym_id)",
+    "CREATE INDEX IF NOT EXISTS releases_average_rating ON releases (average_rating)",
+    """CREATE TABLE IF NOT EXISTS release_artists (
+           release_url TEXT NOT NULL,
+           position INTEGER NOT NULL,
+           artist_url TEXT,
+           artist_name TEXT,
+           PRIMARY KEY (release_url, position))""",
+    "CREATE INDEX IF NOT EXISTS release_artists_artist_url ON release_artists (artist_url)",
+    """CREATE TABLE IF NOT EXISTS release_labels (
+           release_url TEXT NOT NULL,
+           label_url TEXT NOT NULL,
+           label_name TEXT,
+           PRIMARY KEY (release_url, label_url))""",
+    "CREATE INDEX IF NOT EXISTS release_labels_label_url ON release_labels (label_url)",
+    """CREATE TABLE IF NOT EXISTS release_genres (
+           release_url TEXT NOT NULL,
+           genre TEXT NOT NULL,
+           is_primary INTEGER NOT NULL,
+           PRIMARY KEY (release_url, genre))""",
+    "CREATE INDEX IF NOT EXISTS release_genres_genre ON release_genres (genre)",
+    """CREATE TABLE IF NOT EXISTS tracks (
+           release_url TEXT NOT NULL,
+           position INTEGER NOT NULL,
+           number TEXT,
+           title TEXT,
+           length REAL,
+           PRIMARY KEY (release_url, position))""",
+    """CREATE TABLE IF NOT EXISTS credits (
+           release_url TEXT NOT NULL,
+           artist_url TEXT,
+           artist_name TEXT,
+           role TEXT,
+           track_number TEXT)""",
+    "CREATE INDEX IF NOT EXISTS credits_release_url ON credits (release_url)",
+    "CREATE INDEX IF NOT EXISTS credits_artist_url ON credits (artist_url)",
+    """CREATE TABLE IF NOT EXISTS artists (
+           url TEXT PRIMARY KEY,
+           name TEXT,
+           localized_name TEXT,
+           start_date TEXT,
+           end_date TEXT)""",
+    "CREATE INDEX IF NOT EXISTS artists_name ON artists (name)",
+    """CREATE TABLE IF NOT EXISTS genres (
+           url TEXT PRIMARY KEY,
+           name TEXT)""",
+    "CREATE INDEX IF NOT EXISTS genres_name ON genres (name)",
+    """CREATE TABLE IF NOT EXISTS labels (
+           url TEXT PRIMARY KEY,
+           name TEXT,
+           number_of_releases INTEGER)""",
+    "CREATE INDEX IF NOT EXISTS labels_name ON labels (name)",
+    """CREATE TABLE IF NOT EXISTS ratings (
+           username TEXT NOT NULL,
+           release_id TEXT NOT NULL,
+           release_url TEXT,
+           title TEXT,
+           artist_name TEXT,
+           release_year INTEGER,
+           rating REAL,
+           ownership TEXT,
+           purchase_date TEXT,
+           media_type TEXT,
+           review TEXT,
+           PRIMARY KEY (username, release_id))""",
+    "CREATE INDEX IF NOT EXISTS ratings_release_id ON ratings (release_id)",
+)
+
+class SQLiteStore:
+    # parsed entities kept in normalized tables for querying, plus a serialized
+    # copy of each one so it can be rebuilt without a request
+    def __init__(self, path=STORE_PATH) -> None:
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self.transaction():
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    @contextmanager
+    def transaction(self):
+        # nested transactions join the outermost one, which commits everything at once
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._depth == 1:
+                    self._connection.rollback()
+                raise
+            else:
+                if self._depth == 1:
+                    self._connection.commit()
+            finally:
+                self._depth -= 1
+
+    def save(self, entity):
+        with self.transaction():
+            url = canonical_url(entity.url)
+            rym_id = entity.id if isinstance(entity, Release) else None
+            self._connection.execute("""INSERT INTO entities VALUES (?, ?, ?, ?, ?, ?)
+                                        ON CONFLICT (url) DO UPDATE SET type = excluded.type, kind = excluded.kind,
+                                        rym_id = excluded.rym_id, data = excluded.data, stored_at = excluded.stored_at""",
+                                     (url, type(entity).__qualname__, entity._kind, rym_id, dumps(entity), time.time()))
+            match entity:
+                case Release():
+                    self._save_release(url, entity)
+                case Artist():
+                    self._save_artist(url, entity)
+                case Genre():
+                    self._save_genre(url, entity)
+                case Label():
+                    self._save_label(url, entity)
+                case User():
+                    self.save_ratings(entity.username, entity.ratings or ())
+        return entity
+
+    def save_many(self, entities):
+        with self.transaction():
+            for entity in entities:
+                self.save(entity)
+
+    def save_ratings(self, username, ratings):
+        # accepts any iterable of ratings, such as iter_ratings over an export
+        with self.transaction():
+            self._connection.executemany("""INSERT INTO ratings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                            ON CONFLICT (username, release_id) DO UPDATE SET
+                                            release_url = excluded.release_url, title = excluded.title,
+                                            artist_name = excluded.artist_name, release_year = excluded.release_year,
+                                            rating = excluded.rating, ownership = excluded.ownership,
+                                            purchase_date = excluded.purchase_date, media_type = excluded.media_type,
+                                            review = excluded.review""",
+                                         ((username, rating.id, canonical_url(rating.url) if rating.url else None, rating.title,
+                                           rating.artist_name, rating.release_year, rating.rating, rating.ownership,
+                                           rating.purchase_date, rating.media_type, rating.review)
+                                          for rating in ratings if rating.id is not None))
+
+    def _save_release(self, url, release):
+        self._connection.execute("""INSERT INTO releases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                    ON CONFLICT (url) DO UPDATE SET rym_id = excluded.rym_id, title = excluded.title,
+                                    artist_name = excluded.artist_name, type = excluded.type,
+                                    release_date = excluded.release_date, average_rating = excluded.average_rating,
+                                    number_of_ratings = excluded.number_of_ratings,
+                                    number_of_reviews = excluded.number_of_reviews""",
+                                 (url, release.id, release.title, release.artist_name, release.type,
+                                  _date_text(release.release_date), release.average_rating, release.number_of_ratings,
+                                  release.number_of_reviews))
+        for table in ("release_artists", "release_labels", "release_genres", "tracks", "credits"):
+            self._connection.execute(f"DELETE FROM {table} WHERE release_url = ?", (url,))
+
+        self._connection.executemany("INSERT INTO release_artists VALUES (?, ?, ?, ?)",
+                                     ((url, position, _url(artist.url), artist.name)
+                                      for position, artist in enumerate(release.artists or ())))
+        labels = {canonical_url(issue.label.url): issue.label.name
+                  for issue in release.issues or () if issue.label and issue.label.url}
+        self._connection.executemany("INSERT INTO release_labels VALUES (?, ?, ?)",
+                                     ((url, label_url, name) for label_url, name in labels.items()))
+        genres = {genre.name: True for genre in release.primary_genres or ()}
+        for genre in release.secondary_genres or ():
+            genres.setdefault(genre.name, False)
+        self._connection.executemany("INSERT INTO release_genres VALUES (?, ?, ?)",
+                                     ((url, name, int(is_primary)) for name, is_primary in genres.items()))
+        self._connection.executemany("INSERT INTO tracks VALUES (?, ?, ?, ?, ?)",
+                                     ((url, position, track.number, track.title,
+                                       track.length.total_seconds() if track.length is not None else None)
+                                      for position, track in enumerate(release.tracklist or ())))
+        self._connection.executemany("INSERT INTO credits VALUES (?, ?, ?, ?, ?)",
+                                     ((url, _url(artist.url), artist.name, role.name, track.number if track else None)
+                                      for artist in release.credited_artists or ()
+                                      for role in artist.roles or ()
+                                      for track in role.tracks or (None,)))
+
+    def _save_artist(self, url, artist):
+        self._connection.execute("""INSERT INTO artists VALUES (?, ?, ?, ?, ?)
+                                    ON CONFLICT (url) DO UPDATE SET name = excluded.name,
+                                    localized_name = excluded.localized_name, start_date = excluded.start_date,
+                                    end_date = excluded.end_date""",
+                                 (url, artist.name, artist.localized_name, _date_text(artist.start_date),
+                                  _date_text(artist.end_date)))
+
+    def _save_genre(self, url, genre):
+        self._connection.execute("INSERT INTO genres VALUES (?, ?) ON CONFLICT (url) DO UPDATE SET name = excluded.name",
+                                 (url, genre.name))
+
+    def _save_label(self, url, label):
+        self._connection.execute("""INSERT INTO labels VALUES (?, ?, ?)
+                                    ON CONFLICT (url) DO UPDATE SET name = excluded.name,
+                                    number_of_releases = excluded.number_of_releases""",
+                                 (url, label.name, label.number_of_releases))
+
+    def get(self, url):
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM entities WHERE url = ?", (canonical_url(url),)).fetchone()
+        return loads(row[0]) if row else None
+
+    def get_release(self, rym_id):
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM entities WHERE kind = 'release' AND rym_id = ?",
+                                           (str(rym_id),)).fetchone()
+        return loads(row[0]) if row else None
+
+    def load_into(self, entity):
+        # fills an entity that is about to be fetched, returns whether it was stored
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM entities WHERE url = ? AND type = ?",
+                                           (canonical_url(entity.url), type(entity).__qualname__)).fetchone()
+        if not row:
+            return False
+        loads(row[0], into=entity)
+        return True
+
+    def find_releases(self, *, label_url=None, artist_url=None, genre=None, min_rating=None):
+        query = ["SELECT DISTINCT releases.url, releases.title, releases.artist_name, releases.release_date,",
+                 "releases.average_rating, releases.number_of_ratings, releases.number_of_reviews FROM releases"]
+        conditions = list()
+        parameters = list()
+        if label_url:
+            query.append("JOIN release_labels ON release_labels.release_url = releases.url")
+            conditions.append("release_labels.label_url = ?")
+            parameters.append(canonical_url(label_url))
+        if artist_url:
+            query.append("JOIN release_artists ON release_artists.release_url = releases.url")
+            conditions.append("release_artists.artist_url = ?")
+            parameters.append(canonical_url(artist_url))
+        if genre:
+            query.append("JOIN release_genres ON release_genres.release_url = releases.url")
+            conditions.append("release_genres.genre = ?")
+            parameters.append(genre)
+        if min_rating is not None:
+            conditions.append("releases.average_rating >= ?")
+            parameters.append(min_rating)
+        if conditions:
+            query.append("WHERE " + " AND ".join(conditions))
+        query.append("ORDER BY releases.average_rating DESC")
+
+        with self._lock:
+            rows = self._connection.execute(" ".join(query), parameters).fetchall()
+        return [SimpleRelease(url=url, title=title, artist_name=artist_name,
+                              release_date=datetime.fromisoformat(release_date) if release_date else None,
+                              average_rating=average_rating, number_of_ratings=number_of_ratings,
+                              number_of_reviews=number_of_reviews)
+                for url, title, artist_name, release_date, average_rating, number_of_ratings, number_of_reviews in rows]
+
+    def get_ratings(self, username):
+        with self._lock:
+            rows = self._connection.execute("""SELECT release_id, release_url, title, artist_name, release_year, rating,
+                                               ownership, purchase_date, media_type, review
+                                               FROM ratings WHERE username = ?""", (username,)).fetchall()
+        return RatingIndex(Rating(id=release_id, url=release_url, title=title, first_name=artist_name or "",
+                                  release_year=release_year, rating=rating, ownership=ownership,
+                                  purchase_date=purchase_date, media_type=media_type, review=review)
+                           for release_id, release_url, title, artist_name, release_year, rating, ownership,
+                               purchase_date, media_type, review in rows)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+def _url(url):
+    return canonical_url(url) if url else None
+
+def _date_text(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+def enable_store(path=STORE_PATH):
+    store = SQLiteStore(path)
+    base_classes.set_store(store)
+    return store
+
+def disable_store():
+    base_classes.set_store(None)
@@ -0,0 +1,155 @@
+import asyncio
+import re
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+from .cache import ResponseCache, build_response
+from .ratelimiter import limiter
+from .metrics import stats
+from .global_variables import *
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+_session = None
+_session_lock = threading.Lock()
+_cache = None
+_async_sessions = weakref.WeakKeyDictionary()
+_root_url = None
+
+def create_session(*, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, headers=None):
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    if headers:
+        session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def set_session(session):
+    # any object with a requests-like get(url, **kwargs) can be plugged in here
+    global _session
+    with _session_lock:
+        _session = session
+
+def configure_session(*, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, headers=None):
+    set_session(create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize, headers=headers))
+
+def get_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+def create_async_session(*, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, headers=None):
+    if aiohttp is None:
+        raise ImportError("The async API requires aiohttp to be installed.")
+    connector = aiohttp.TCPConnector(limit=pool_connections * pool_maxsize, limit_per_host=pool_maxsize)
+    return aiohttp.ClientSession(connector=connector, headers={**HEADERS, **(headers or {})})
+
+def set_async_session(session):
+    # sessions are bound to the event loop they are used from
+    _async_sessions[asyncio.get_running_loop()] = session
+
+def get_async_session():
+    loop = asyncio.get_running_loop()
+    session = _async_sessions.get(loop)
+    if session is None or session.closed:
+        session = _async_sessions[loop] = create_async_session()
+    return session
+
+async def close_async_session():
+    if session := _async_sessions.pop(asyncio.get_running_loop(), None):
+        await session.close()
+
+def enable_cache(path=CACHE_PATH, *, max_size=CACHE_MAX_SIZE, ttls=None):
+    global _cache
+    _cache = ResponseCache(path, max_size=max_size, ttls=ttls)
+    return _cache
+
+def disable_cache():
+    set_cache(None)
+
+def set_cache(cache):
+    global _cache
+    _cache = cache
+
+def get_cache():
+    return _cache
+
+def canonical_url(url):
+    parts = urlsplit(url)
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+def configure_rate_limit(*, calls=CALL_LIMIT, period=RATE_LIMIT, burst=None):
+    limiter.configure(calls=calls, period=period, burst=burst)
+
+def set_root_url(url=None):
+    # sends requests for ROOT_URL pages to another server, e.g. a local stand-in.
+    # Entities keep their rateyourmusic.com URLs, only the request is redirected.
+    # The response cache is bypassed meanwhile, so that pages of the other server
+    # are never stored or served as the real ones
+    global _root_url
+    _root_url = url.rstrip("/") if url else None
+
+def _request_url(url):
+    if _root_url and url.startswith(ROOT_URL):
+        return _root_url + url[len(ROOT_URL):]
+    return url
+
+def get(url, *, kind=None, fresh=False, entity=None, **kwargs):
+    # fresh skips the cached copy but still stores the new response. entity names
+    # what the page is fetched for in the metrics, see rympy.metrics
+    entity = entity or kind or "other"
+    cache = _cache if _root_url is None else None
+    key = canonical_url(url)
+    if cache is not None and cache.caches(kind) and not fresh:
+        if (response := cache.get(key)) is not None:
+            stats.count("cache_hits", entity)
+            return response
+
+    stats.observe("rate_limit_wait", entity, limiter.acquire())
+    start = time.perf_counter()
+    response = get_session().get(_request_url(url), **kwargs)
+    _record_response(entity, response, time.perf_counter() - start, kwargs.get("stream"))
+
+    if cache is not None and cache.caches(kind) and response.status_code == 200:
+        cache.set(key, kind, response)
+    return response
+
+async def aget(url, *, kind=None, fresh=False, entity=None, **kwargs):
+    entity = entity or kind or "other"
+    cache = _cache if _root_url is None else None
+    key = canonical_url(url)
+    if cache is not None and cache.caches(kind) and not fresh:
+        if (response := cache.get(key)) is not None:
+            stats.count("cache_hits", entity)
+            return response
+
+    stats.observe("rate_limit_wait", entity, await limiter.aacquire())
+    start = time.perf_counter()
+    async with get_async_session().get(_request_url(url), **kwargs) as client_response:
+        response = build_response(str(client_response.url), client_response.status, dict(client_response.headers),
+                                  client_response.charset, await client_response.read())
+    _record_response(entity, response, time.perf_counter() - start)
+
+    if cache is not None and cache.caches(kind) and response.status_code == 200:
+        cache.set(key, kind, response)
+    return response
+
+def _record_response(entity, response, latency, stream=False):
+    # a streamed body isn't read yet, its size is taken from the headers
+    size = int(response.headers.get("Content-Length") or 0) if stream else len(response.content)
+    stats.count("requests", entity, url=response.url, status=response.status_code)
+    stats.count(f"status_{response.status_code}", entity)
+    stats.count("bytes", entity, size)
+    stats.observe("latency", entity, latency)
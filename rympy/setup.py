@@ -4,4 +4,5 @@ setup(
     name='rympy',
     version='0.1',
     packages=find_packages(),
-)
\ No newline at end of file
+    package_data={'rympy.benchmarks': ['corpus/*/*.html', 'corpus/*/*.json']},
+)
@@ -0,0 +1,49 @@
+import pytest
+from rympy import base_classes
+from rympy import transport
+from rympy.benchmarks import Corpus
+from rympy.cache import build_response
+from rympy.identity import identity_map
+from rympy.ratelimiter import TokenBucket
+from rympy.transport import canonical_url
+
+class StubSession:
+    # stands in for the requests session: answers from a dict of pages and records
+    # every URL asked for. A page with an ETag answers 304 to a matching If-None-Match
+    def __init__(self) -> None:
+        self.pages = dict()
+        self.requests = list()
+
+    def add(self, url, content, *, status=200, headers=None):
+        self.pages[canonical_url(url)] = (status, {"Content-Type": "text/html; charset=utf-8", **(headers or {})}, content)
+
+    def add_corpus(self, corpus):
+        for page in corpus.pages:
+            self.add(page["url"], corpus.content(page))
+        return self
+
+    def get(self, url, **kwargs):
+        self.requests.append(url)
+        if (page := self.pages.get(canonical_url(url))) is None:
+            return build_response(url, 404, {}, "utf-8", b"")
+        status, headers, content = page
+        if "ETag" in headers and (kwargs.get("headers") or {}).get("If-None-Match") == headers["ETag"]:
+            return build_response(url, 304, headers, "utf-8", b"")
+        return build_response(url, status, headers, "utf-8", content)
+
+    def count(self, url):
+        return sum(canonical_url(requested) == canonical_url(url) for requested in self.requests)
+
+@pytest.fixture
+def session(monkeypatch):
+    # the corpus pages behind a stub session, with no rate limit, cache, store or
+    # entities left over from another test
+    session = StubSession().add_corpus(Corpus())
+    monkeypatch.setattr(transport, "_session", session)
+    monkeypatch.setattr(transport, "_cache", None)
+    monkeypatch.setattr(transport, "_root_url", None)
+    monkeypatch.setattr(transport, "limiter", TokenBucket(calls=10 ** 9, period=1))
+    monkeypatch.setattr(base_classes, "_store", None)
+    identity_map.clear()
+    yield session
+    identity_map.clear()
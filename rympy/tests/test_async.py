@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import pytest
+from rympy import *
+from rympy import transport
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/1/"
+
+class StubClientResponse:
+    def __init__(self, response) -> None:
+        self.url = response.url
+        self.status = response.status_code
+        self.headers = response.headers
+        self.charset = response.encoding
+        self._content = response.content
+
+    async def read(self):
+        return self._content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+class StubAsyncSession:
+    # the aiohttp side of the stub session, answering from the same pages
+    def __init__(self, session) -> None:
+        self._session = session
+        self.closed = False
+
+    def get(self, url, **kwargs):
+        return StubClientResponse(self._session.get(url, **kwargs))
+
+@pytest.fixture
+def async_session(session, monkeypatch):
+    monkeypatch.setattr(transport, "get_async_session", lambda: StubAsyncSession(session))
+    return session
+
+def record_threads(monkeypatch, cls, extractor):
+    threads = list()
+    original = getattr(cls, extractor)
+
+    def recording(self):
+        threads.append(threading.current_thread())
+        return original(self)
+
+    monkeypatch.setattr(cls, extractor, recording)
+    return threads
+
+def test_afetch_extracts_requested_fields_off_the_event_loop(async_session, monkeypatch):
+    threads = record_threads(monkeypatch, Release, "_fetch_title")
+
+    async def fetch():
+        release = await Release.afetch(RELEASE_URL, fields=("title",))
+        return release, threading.current_thread()
+
+    release, loop_thread = asyncio.run(fetch())
+    assert "title" in vars(release)
+    assert release.title == "OK Computer"
+    assert threads and loop_thread not in threads
+    assert async_session.count(RELEASE_URL) == 1
+
+def test_aread_reads_fields_off_the_event_loop(async_session, monkeypatch):
+    threads = record_threads(monkeypatch, Release, "_fetch_title")
+
+    async def read():
+        release = await Release.afetch(RELEASE_URL)
+        return await release.aread("title"), await release.aread("title", "type"), threading.current_thread()
+
+    title, values, loop_thread = asyncio.run(read())
+    assert title == "OK Computer"
+    assert values == ("OK Computer", "Album")
+    assert len(threads) == 1 and loop_thread not in threads
+
+def test_apages_yields_the_loaded_pages(async_session):
+    content = async_session.pages[transport.canonical_url(CHART_URL)][2]
+    for page in range(2, 11):
+        async_session.add(CHART_URL.replace("/1/", f"/{page}/"), content)
+
+    async def pages():
+        chart = await Chart.afetch(type=ChartType.top, release_types=[ReleaseType.album])
+        return [entries async for entries in chart.apages()], chart
+
+    pages, chart = asyncio.run(pages())
+    assert transport.canonical_url(chart.init_url) == CHART_URL
+    assert len(pages) == chart.max_page
+    assert pages[0] == chart.entries[0]
@@ -0,0 +1,45 @@
+import threading
+import time
+from rympy import *
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+LABEL_URL = "https://rateyourmusic.com/label/parlophone/"
+GENRE_URL = "https://rateyourmusic.com/genre/alternative-rock/"
+MISSING_URL = "https://rateyourmusic.com/release/album/nobody/nothing/"
+
+def test_every_item_gets_a_result_and_failures_are_kept(session):
+    items = [RELEASE_URL, SimpleLabel(name="Parlophone", url=LABEL_URL), MISSING_URL, GENRE_URL]
+    results = list(fetch_many(items, max_workers=2))
+    assert sorted(map(id, (result.item for result in results))) == sorted(map(id, items))
+    by_item = {id(result.item): result for result in results}
+    assert isinstance(by_item[id(items[0])].entity, Release)
+    assert by_item[id(items[1])].entity.name == "Parlophone"
+    failed = by_item[id(items[2])]
+    assert not failed.ok and failed.entity is None and isinstance(failed.error, RequestFailed)
+    assert all(result.ok for result in results if result is not failed)
+
+def test_same_page_is_hydrated_once(session):
+    results = list(fetch_many([RELEASE_URL, SimpleRelease(title="OK Computer", url=RELEASE_URL)], max_workers=2))
+    assert results[0].entity is results[1].entity
+    assert session.count(RELEASE_URL) == 1
+
+def test_requests_stay_within_max_workers(session, monkeypatch):
+    active = list()
+    peak = list()
+    lock = threading.Lock()
+    get = session.get
+
+    def slow_get(url, **kwargs):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(url)
+        return get(url, **kwargs)
+
+    monkeypatch.setattr(session, "get", slow_get)
+    items = [f"https://rateyourmusic.com/release/album/stub/{number}/" for number in range(8)]
+    results = list(fetch_many(items, max_workers=3))
+    assert len(results) == 8 and not any(result.ok for result in results)
+    assert max(peak) == 3
@@ -0,0 +1,56 @@
+import time
+from rympy import transport
+from rympy.cache import ResponseCache, build_response
+
+URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+
+def test_second_fetch_is_served_from_the_cache(session, tmp_path):
+    cache = transport.enable_cache(str(tmp_path / "cache.sqlite3"))
+    first = transport.get(URL, kind="release")
+    second = transport.get(URL, kind="release")
+    assert session.count(URL) == 1
+    assert len(cache) == 1
+    assert cache.size() == len(first.content)
+    assert getattr(second, "from_cache", False)
+    assert second.content == first.content
+
+def test_fresh_fetch_skips_the_cached_copy(session, tmp_path):
+    transport.enable_cache(str(tmp_path / "cache.sqlite3"))
+    transport.get(URL, kind="release")
+    transport.get(URL, kind="release", fresh=True)
+    assert session.count(URL) == 2
+
+def test_uncached_kind_is_not_stored(session, tmp_path):
+    cache = transport.enable_cache(str(tmp_path / "cache.sqlite3"))
+    transport.get(URL)
+    transport.get(URL)
+    assert session.count(URL) == 2
+    assert len(cache) == 0
+
+def test_expired_page_is_fetched_again(session, tmp_path):
+    transport.enable_cache(str(tmp_path / "cache.sqlite3"), ttls={"release": 0})
+    transport.get(URL, kind="release")
+    time.sleep(0.01)
+    transport.get(URL, kind="release")
+    assert session.count(URL) == 2
+
+def test_least_recently_used_pages_are_evicted(session, tmp_path):
+    urls = [f"https://rateyourmusic.com/release/album/stub/{number}/" for number in range(3)]
+    for url in urls:
+        session.add(url, b"x" * 100)
+    cache = transport.enable_cache(str(tmp_path / "cache.sqlite3"), max_size=250)
+    transport.get(urls[0], kind="release")
+    transport.get(urls[1], kind="release")
+    transport.get(urls[0], kind="release")
+    transport.get(urls[2], kind="release")
+    assert len(cache) == 2
+    assert cache.size() == 200
+    assert cache.get(transport.canonical_url(urls[1])) is None
+    assert cache.get(transport.canonical_url(urls[0])) is not None
+
+def test_size_survives_reopening(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache(path)
+    response = build_response(URL, 200, {}, "utf-8", b"page")
+    cache.set(URL, "release", response)
+    assert ResponseCache(path).size() == cache.size() == 4
@@ -0,0 +1,73 @@
+import re
+import time
+import pytest
+from rympy import *
+from rympy import transport
+
+CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/1/"
+
+@pytest.fixture
+def chart(session):
+    # ten chart pages, each with its number in the first title
+    content = session.pages[CHART_URL][2]
+    for page in range(1, 11):
+        session.add(CHART_URL.replace("/1/", f"/{page}/"), content.replace(b"Mirror Signal", f"Mirror Signal {page}".encode()))
+    return Chart.from_url(CHART_URL)
+
+def requested_pages(session):
+    return [int(re.search(r"/(\d+)/$", url).group(1)) for url in session.requests]
+
+def page_of(entry):
+    return int(re.search(r"Mirror Signal (\d+)", entry.title).group(1)) if "Mirror Signal" in entry.title else None
+
+def test_entries_are_read_in_page_order(chart, session):
+    entries = list(chart.iter_entries())
+    assert [page_of(entry) for entry in entries if page_of(entry)] == list(range(1, 11))
+    assert len(entries) == sum(map(len, chart.entries)) and len(chart.entries) == 10
+    assert requested_pages(session) == list(range(1, 11))
+
+def test_pages_are_fetched_at_most_one_ahead(chart, session):
+    current = 1
+    for entry in chart.iter_entries():
+        current = page_of(entry) or current
+        assert max(requested_pages(session)) <= current + 1
+    assert sorted(requested_pages(session)) == list(range(1, 11))
+
+def test_nothing_is_fetched_before_iterating(chart, session):
+    entries = chart.iter_entries()
+    time.sleep(0.05)
+    assert requested_pages(session) == [1]
+    next(entries)
+    entries.close()
+
+def test_closing_early_stops_requests(chart, session):
+    entries = chart.iter_entries()
+    for entry in entries:
+        if page_of(entry) == 3:
+            break
+    entries.close()
+    time.sleep(0.1)
+    requested = requested_pages(session)
+    assert max(requested) <= 4
+    time.sleep(0.1)
+    assert requested_pages(session) == requested
+
+def test_load_pages_in_any_order_loads_every_page_up_to_the_highest(chart, session):
+    assert chart.load_pages([5, 3, 3, 2], workers=3) is chart
+    assert [next(filter(None, map(page_of, entries))) for entries in chart.entries] == [1, 2, 3, 4, 5]
+    assert chart.current_page == 5
+    assert sorted(requested_pages(session)) == [1, 2, 3, 4, 5]
+
+def test_load_pages_skips_pages_already_loaded(chart, session):
+    chart.load_pages([3])
+    chart.load_pages([2, 3])
+    chart.load_pages([])
+    assert len(chart.entries) == 3
+    assert sorted(requested_pages(session)) == [1, 2, 3]
+
+def test_load_pages_past_the_last_page(chart, session):
+    with pytest.raises(NoContent):
+        chart.load_pages(range(9, 12))
+    assert requested_pages(session) == [1]
+    chart.load_pages(range(9, 11))
+    assert len(chart.entries) == chart.max_page == 10
@@ -0,0 +1,50 @@
+import pytest
+from rympy import *
+from rympy import base_classes
+from rympy.base_classes import _field_state
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+ARTIST_URL = "https://rateyourmusic.com/artist/the-fall"
+LABEL_URL = "https://rateyourmusic.com/label/parlophone/"
+CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/1/"
+
+LOADERS = {"Release": lambda **kwargs: Release(RELEASE_URL, **kwargs),
+           "Artist": lambda **kwargs: Artist(url=ARTIST_URL, **kwargs),
+           "Label": lambda **kwargs: Label(LABEL_URL, **kwargs)}
+
+def field_states(entity):
+    states = dict()
+    for name in entity._lazy_fields():
+        try:
+            states[name] = _field_state(getattr(entity, name))
+        except Exception as exception:
+            states[name] = ("error", type(exception).__name__)
+    return states
+
+def assert_page_dropped(entity):
+    assert entity._soup is None and entity._tree is None and entity._cached_rym_response is None
+    assert entity.__dict__.get("_unparsed_page") is None
+
+@pytest.mark.parametrize("name", LOADERS)
+def test_compact_entity_drops_its_page_and_keeps_every_field(session, name):
+    compact = LOADERS[name](compact=True)
+    assert_page_dropped(compact)
+    assert all(field in vars(compact) for field in compact._lazy_fields())
+    assert field_states(compact) == field_states(LOADERS[name]())
+
+def test_set_compact_applies_to_new_entities(session, monkeypatch):
+    monkeypatch.setattr(base_classes, "_compact", False)
+    set_compact()
+    label = Label(LABEL_URL)
+    assert_page_dropped(label)
+    assert label.name == "Parlophone"
+    assert Label(LABEL_URL, compact=False)._soup is not None
+
+def test_compact_collection_drops_every_page(session):
+    content = session.pages[CHART_URL][2]
+    session.add(CHART_URL.replace("/1/", "/2/"), content)
+    chart = Chart.from_url(CHART_URL, compact=True)
+    assert_page_dropped(chart)
+    chart.load_more_entries()
+    assert_page_dropped(chart)
+    assert len(chart.entries) == 2 and chart.entries[1]
@@ -0,0 +1,101 @@
+import pytest
+from rympy import *
+from rympy import transport
+from rympy.crawler import Crawler
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+ARTIST_URL = "https://rateyourmusic.com/artist/the-fall"
+LABEL_URL = "https://rateyourmusic.com/label/parlophone/"
+CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/1/"
+
+def urls(entities):
+    return [transport.canonical_url(entity.url) for entity in entities]
+
+def test_crawl_stops_at_max_depth(session):
+    assert urls(Crawler([RELEASE_URL], max_depth=0).crawl()) == [RELEASE_URL]
+    assert session.requests == [RELEASE_URL]
+
+def test_links_are_followed_and_failures_recorded(session):
+    crawler = Crawler([RELEASE_URL], max_depth=1, kinds={"release", "label", "artist"})
+    assert urls(crawler.crawl()) == [RELEASE_URL, LABEL_URL]
+    assert "https://rateyourmusic.com/artist/radiohead" in crawler.failed
+    assert not crawler.frontier
+    assert {RELEASE_URL, LABEL_URL} <= crawler.visited
+
+def test_rate_limited_crawl_resumes_from_the_checkpoint(session, tmp_path):
+    checkpoint_path = str(tmp_path / "crawl.json")
+    label_page = session.pages[LABEL_URL]
+    session.add(LABEL_URL, b"", status=503)
+    crawler = Crawler([RELEASE_URL], max_depth=1, kinds={"release", "label"}, checkpoint_path=checkpoint_path)
+    crawled = list()
+    with pytest.raises(RateLimit):
+        for entity in crawler.crawl():
+            crawled.append(entity)
+    assert urls(crawled) == [RELEASE_URL]
+
+    session.pages[LABEL_URL] = label_page
+    session.requests.clear()
+    resumed = Crawler(max_depth=1, kinds={"release", "label"}, checkpoint_path=checkpoint_path)
+    assert urls(resumed.crawl()) == [LABEL_URL]
+    assert session.requests[0] == LABEL_URL
+    assert RELEASE_URL not in session.requests
+    assert not resumed.frontier
+
+def test_names_without_a_link_are_skipped(session, monkeypatch):
+    monkeypatch.setattr(Artist, "_fetch_member_of", lambda self: ["Unlinked Band", SimpleArtist(name="Linked", url="/artist/linked")])
+    crawler = Crawler([ARTIST_URL], max_depth=1, kinds={"artist"})
+    crawled = urls(crawler.crawl())
+    assert crawled[0] == ARTIST_URL
+    assert "https://rateyourmusic.com/artist/linked" in crawler.failed
+    assert ARTIST_URL in crawler.visited
+
+def test_failed_collection_page_is_recorded(session, tmp_path):
+    crawler = Crawler([CHART_URL, LABEL_URL], max_depth=0, checkpoint_path=str(tmp_path / "crawl.json"))
+    assert urls(crawler.crawl()) == [LABEL_URL]
+    assert "RequestFailed" in crawler.failed[CHART_URL]
+    assert not crawler.collections
+
+def test_collection_pages_are_checkpointed(session, tmp_path):
+    content = session.pages[CHART_URL][2]
+    for page in range(2, 11):
+        session.add(CHART_URL.replace("/1/", f"/{page}/"), content)
+    session.add(CHART_URL.replace("/1/", "/4/"), b"", status=503)
+    checkpoint_path = str(tmp_path / "crawl.json")
+    with pytest.raises(RateLimit):
+        list(Crawler([CHART_URL], max_depth=0, checkpoint_path=checkpoint_path).crawl())
+
+    session.add(CHART_URL.replace("/1/", "/4/"), content)
+    session.requests.clear()
+    resumed = Crawler(max_depth=0, checkpoint_path=checkpoint_path)
+    chart, = resumed.crawl()
+    assert session.requests == [CHART_URL.replace("/1/", f"/{page}/") for page in range(4, 11)]
+    assert len(chart.entries) == chart.max_page
+
+def count_checkpoints(monkeypatch):
+    writes = list()
+    checkpoint = Crawler.checkpoint
+
+    def counting(self):
+        writes.append(len(self.visited))
+        checkpoint(self)
+
+    monkeypatch.setattr(Crawler, "checkpoint", counting)
+    return writes
+
+def test_checkpoints_are_batched(session, tmp_path, monkeypatch):
+    writes = count_checkpoints(monkeypatch)
+    crawler = Crawler([RELEASE_URL], max_depth=1, checkpoint_path=str(tmp_path / "crawl.json"), checkpoint_every=5)
+    list(crawler.crawl())
+    visited = len(crawler.visited)
+    assert visited > 5
+    assert len(writes) == visited // 5 + 1
+    assert writes[-1] == visited
+
+def test_checkpoint_is_written_when_the_crawl_stops(session, tmp_path, monkeypatch):
+    writes = count_checkpoints(monkeypatch)
+    session.add(LABEL_URL, b"", status=503)
+    crawler = Crawler([RELEASE_URL], max_depth=1, kinds={"release", "label"}, checkpoint_path=str(tmp_path / "crawl.json"))
+    with pytest.raises(RateLimit):
+        list(crawler.crawl())
+    assert writes == [1]
+    assert Crawler(checkpoint_path=str(tmp_path / "crawl.json")).frontier[0] == (LABEL_URL, 1)
@@ -0,0 +1,71 @@
+import gc
+import threading
+from rympy import *
+from rympy import transport
+from rympy.identity import IdentityMap, identity_map
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+GENRE_URL = "https://rateyourmusic.com/genre/alternative-rock/"
+CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/1/"
+GENRE_CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/g:Alternative Rock/1/"
+
+class Page:
+    def __init__(self, url) -> None:
+        self.url = url
+
+def test_same_url_gives_one_object(session):
+    release = get_entity(RELEASE_URL)
+    assert get_entity("HTTPS://RateYourMusic.com//release/album/radiohead/ok-computer/") is release
+    assert SimpleRelease(title="OK Computer", url=RELEASE_URL).get_release() is release
+    assert session.count(RELEASE_URL) == 1
+
+def test_chart_is_keyed_on_its_first_page(session):
+    chart = get_entity("https://rateyourmusic.com/charts/top/album/all-time/")
+    assert chart.init_url == CHART_URL
+    assert get_entity(CHART_URL) is chart
+    assert session.count(CHART_URL) == 1
+
+def test_genre_charts_go_through_the_identity_map(session):
+    session.add(GENRE_CHART_URL, session.pages[transport.canonical_url(CHART_URL)][2])
+    genre = get_entity(GENRE_URL)
+    chart = genre.top_chart
+    assert genre.chart() is chart
+    assert get_entity(GENRE_CHART_URL) is chart
+    assert session.count(GENRE_CHART_URL) == 1
+
+def test_concurrent_hydrations_create_one_object():
+    identity_map = IdentityMap()
+    created = list()
+    barrier = threading.Barrier(8)
+
+    def factory():
+        created.append(object())
+        return Page(RELEASE_URL)
+
+    def hydrate():
+        barrier.wait()
+        results.append(identity_map.get_or_create(Page, RELEASE_URL, factory))
+
+    results = list()
+    threads = [threading.Thread(target=hydrate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1
+    assert all(result is results[0] for result in results)
+
+def test_only_recent_entities_are_kept_alive():
+    identity_map = IdentityMap(max_size=2)
+    for number in range(4):
+        identity_map.add(Page(f"{RELEASE_URL}{number}/"))
+    gc.collect()
+    assert len(identity_map) == 2
+    assert identity_map.get(Page, f"{RELEASE_URL}0/") is None
+    assert identity_map.get(Page, f"{RELEASE_URL}3/") is not None
+
+def test_discard_forgets_the_entity(session):
+    release = get_entity(RELEASE_URL)
+    identity_map.discard(release)
+    assert get_entity(RELEASE_URL) is not release
+    assert session.count(RELEASE_URL) == 2
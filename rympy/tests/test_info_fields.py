@@ -0,0 +1,70 @@
+import re
+from datetime import datetime
+from functools import cache
+import pytest
+from rympy.benchmarks import Corpus, load_entity, offline
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+ARTIST_URL = "https://rateyourmusic.com/artist/the-fall"
+ARTIST_TITLES = ("Formed", "Born", "Disbanded", "Died", "Currently", "Genres", "Members",
+                 "Also Known As", "Member of", "Related Artists", "Notes")
+
+corpus = Corpus()
+
+# how the fields were read before the info tables were walked once into _info
+def baseline_recording_date(soup):
+    if proto_date := re.findall(r'Recorded<td colspan="2">(.{1,17})<\/td>', str(soup)):
+        return proto_date[0]
+
+def baseline_type(soup):
+    if types_proto := re.findall(r"Type((?:\w+, )*\w+)", soup.text):
+        return types_proto[0]
+
+def baseline_artist_info(soup, title):
+    if info_div := soup.find("div", class_="info_hdr", string=title):
+        return info_div.find_next_sibling()
+
+@cache
+def load(class_name, url):
+    with offline(corpus, "html.parser", False):
+        return load_entity(class_name, url)
+
+def load_edited(class_name, url, edit, tmp_path):
+    page = next(page for page in corpus.pages if page["url"] == url)
+    edited = Corpus(str(tmp_path))
+    edited.add(class_name, url, edit(corpus.content(page).decode("utf-8")).encode("utf-8"), page["file"])
+    with offline(edited, "html.parser", False):
+        return load_entity(class_name, url)
+
+def test_release_info_fields():
+    release = load("Release", RELEASE_URL)
+    assert release.type == baseline_type(release._soup) == "Album"
+    assert release.recording_date == baseline_recording_date(release._soup) == "July 1996"
+
+def test_release_info_without_info_row_headers(tmp_path):
+    release = load_edited("Release", RELEASE_URL, lambda text: text.replace(' class="info_row"', ""), tmp_path)
+    assert release._info == {}
+    assert release.type == baseline_type(release._soup) == "Album"
+    assert release.recording_date == baseline_recording_date(release._soup) == "July 1996"
+
+def test_release_info_without_recording_date(tmp_path):
+    release = load_edited("Release", RELEASE_URL, lambda text: re.sub(r'<tr><th class="info_row">Recorded.*?</tr>', "", text), tmp_path)
+    assert release.recording_date is baseline_recording_date(release._soup) is None
+    assert release.type == "Album"
+
+@pytest.mark.parametrize("title", ARTIST_TITLES)
+def test_artist_info_content(title):
+    artist = load("Artist", ARTIST_URL)
+    assert artist._info_content(title) is baseline_artist_info(artist._soup, title)
+
+def test_artist_info_fields():
+    artist = load("Artist", ARTIST_URL)
+    assert artist.start_date == datetime(1976, 1, 1)
+    assert str(artist.start_location) == "Prestwich, Greater Manchester, England"
+    assert str(artist.current_location) == "England"
+    assert [genre.name for genre in artist.genres] == ["Post-Punk", "Art Punk", "Garage Rock", "Krautrock"]
+    assert [member.name for member in artist.members] == ["Mark E Smith", "Martin Bramah", "Brix Smith", "Steve Hanley"]
+    assert [aka.name for aka in artist.akas] == ["The Fall Group", "Mark E Smith and The Fall"]
+    assert artist.member_of is None
+    assert [related.name for related in artist.related_artists] == ["The Adult Net", "Brix & The Extricated"]
+    assert artist.notes == "Named after the novel by Albert Camus."
@@ -0,0 +1,42 @@
+import threading
+import time
+from rympy import *
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+
+def test_field_is_extracted_on_first_read(session):
+    release = get_entity(RELEASE_URL)
+    assert "title" not in vars(release)
+    assert release.title == "OK Computer"
+    assert "title" in vars(release)
+
+def test_concurrent_first_reads_link_credits_once(session, monkeypatch):
+    calls = list()
+    link_credits = Release._link_credits
+
+    def slow_link_credits(self):
+        calls.append(threading.current_thread())
+        time.sleep(0.05)
+        link_credits(self)
+
+    monkeypatch.setattr(Release, "_link_credits", slow_link_credits)
+    release = get_entity(RELEASE_URL)
+    barrier = threading.Barrier(4)
+    results = dict()
+
+    def read(first, second):
+        barrier.wait()
+        results[threading.current_thread()] = (getattr(release, first), getattr(release, second))
+
+    threads = [threading.Thread(target=read, args=names) for names in [("tracklist", "credited_artists"),
+                                                                        ("credited_artists", "tracklist")] * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    tracks = {id(track) for track in release.tracklist}
+    assert all(release.tracklist in values and release.credited_artists in values for values in results.values())
+    assert all(id(track) in tracks for credit in release.credited_artists for role in credit.roles
+               for track in role.tracks or ())
@@ -0,0 +1,24 @@
+import types
+import rympy
+from rympy import *
+from rympy import transport
+
+LABEL_URL = "https://rateyourmusic.com/label/parlophone/"
+
+def test_metrics_module_is_not_shadowed():
+    assert isinstance(rympy.metrics, types.ModuleType)
+    assert rympy.stats is rympy.metrics.stats
+    for name in ("set_parser", "enable_cache", "configure_rate_limit", "enable_store", "set_store",
+                 "set_compact", "set_profiling", "set_session", "set_root_url"):
+        assert callable(getattr(rympy, name))
+    assert rympy.limiter is transport.limiter
+
+def test_fetches_are_counted_per_entity_type(session):
+    stats.reset()
+    label = Label(LABEL_URL)
+    assert label.name == "Parlophone"
+    report = stats.report()["Label"]
+    assert report["requests"] == report["status_200"] == 1
+    assert report["bytes"] == len(session.pages[LABEL_URL][2])
+    assert report["latency"]["count"] == report["parse"]["count"] == 1
+    assert "Label" in format_metrics()
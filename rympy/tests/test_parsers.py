@@ -0,0 +1,66 @@
+from functools import cache
+import pytest
+from rympy import parsing
+from rympy.base_classes import _field_state
+from rympy.benchmarks import Corpus, load_entity, offline
+
+corpus = Corpus()
+
+MODES = [pytest.param("lxml", False, marks=pytest.mark.skipif(parsing.lxml is None, reason="lxml is not installed")),
+         pytest.param("html.parser", True, marks=pytest.mark.skipif(parsing.LexborHTMLParser is None, reason="selectolax is not installed"))]
+
+@cache
+def extracted(file, parser, fast_extraction):
+    page = next(page for page in corpus.pages if page["file"] == file)
+    with offline(corpus, parser, fast_extraction):
+        entity = load_entity(page["class"], page["url"])
+        fields = dict()
+        for name in entity._lazy_fields():
+            if name.startswith("_"):
+                continue
+            try:
+                fields[name] = _field_state(getattr(entity, name))
+            except Exception as exception:
+                fields[name] = ("error", repr(exception))
+        if hasattr(entity, "entries"):
+            fields["max_page"] = entity.max_page
+            fields["entries"] = _field_state(entity.entries)
+    return fields
+
+def test_corpus_has_every_entity():
+    assert {page["class"] for page in corpus.pages} >= {"Release", "Artist", "Genre", "Label", "Chart", "Release.Reviews", "User"}
+
+@pytest.mark.parametrize("file", [page["file"] for page in corpus.pages])
+def test_default_parser_extracts_every_field(file):
+    fields = extracted(file, "html.parser", False)
+    assert fields
+    assert not {name: value for name, value in fields.items() if isinstance(value, tuple) and value[:1] == ("error",)}
+
+@pytest.mark.parametrize("parser, fast_extraction", MODES)
+@pytest.mark.parametrize("file", [page["file"] for page in corpus.pages])
+def test_same_output_as_html_parser(file, parser, fast_extraction):
+    assert extracted(file, parser, fast_extraction) == extracted(file, "html.parser", False)
+
+def test_fast_extraction_builds_soup_only_when_read(monkeypatch):
+    soups = list()
+    make_soup = parsing.make_soup
+    monkeypatch.setattr(parsing, "make_soup", lambda content: soups.append(content) or make_soup(content))
+    with offline(corpus, "html.parser", True):
+        artist = load_entity("Artist", "https://rateyourmusic.com/artist/the-fall")
+        assert artist.name == "The Fall"
+        assert len(artist.discography.albums) == 420
+        assert artist.appears_on.albums
+        assert not soups
+        assert artist.notes == "Named after the novel by Albert Camus."
+        assert len(soups) == 1
+
+@pytest.mark.parametrize("parser, module", [("lxml", "lxml"), ("html5lib", "html5lib")])
+def test_missing_parser_is_refused(parser, module, monkeypatch):
+    monkeypatch.setattr(parsing, module, None)
+    with pytest.raises(ImportError, match=parser):
+        parsing.set_parser(parser)
+    assert parsing.get_parser() == "html.parser"
+
+def test_unknown_parser_is_refused():
+    with pytest.raises(ValueError):
+        parsing.set_parser("regex")
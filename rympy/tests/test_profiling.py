@@ -0,0 +1,50 @@
+import pytest
+from rympy import *
+from rympy import profiling
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+ARTIST_URL = "https://rateyourmusic.com/artist/the-fall"
+
+@pytest.fixture
+def profiled_session(session, monkeypatch):
+    monkeypatch.setattr(profiling, "_profiling", False)
+    profiler.reset()
+    set_profiling()
+    yield session
+    profiler.reset()
+
+def tree(nodes):
+    return [(node["name"], tree(node["children"])) for node in nodes]
+
+def test_entity_records_its_calls(profiled_session):
+    artist = Artist(url=ARTIST_URL)
+    artist.discography
+    phases = tree(instance_profile(artist))
+    assert phases[0] == ("_extract", []) and phases[-1][0] == "_fetch_discography"
+    (initialize, fetches), = phases[-1][1]
+    assert initialize == "initialize_attributes"
+    assert {name for name, _ in fetches} == {"_fetch_releases"} and len(fetches) == 12
+
+    for node in instance_profile(artist):
+        assert node["owner"] == "Artist"
+        assert 0 <= node["self_seconds"] <= node["seconds"]
+        assert node["seconds"] >= sum(child["seconds"] for child in node["children"])
+
+def test_report_totals_every_call(profiled_session):
+    release = Release(RELEASE_URL)
+    release.tracklist
+    report = profiler.report()["Release"]
+    assert {"_extract", "_fetch_linked_tracklist", "_fetch_tracks"} <= set(report)
+    assert report["_fetch_linked_tracklist"]["count"] == 1
+    assert report["_fetch_linked_tracklist"]["slowest"][0][1] == RELEASE_URL
+
+    lines = format_profile().splitlines()
+    assert lines[0].startswith("method")
+    assert any(line.startswith("Release._fetch_linked_tracklist ") for line in lines)
+    assert format_profile(release).splitlines()[0].startswith("_extract")
+
+def test_nothing_is_recorded_when_profiling_is_off(profiled_session):
+    set_profiling(False)
+    release = Release(RELEASE_URL)
+    release.tracklist
+    assert instance_profile(release) == [] and profiler.report() == {}
@@ -0,0 +1,67 @@
+import asyncio
+import types
+import pytest
+from rympy import ratelimiter
+from rympy import transport
+from rympy.ratelimiter import TokenBucket
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept = list()
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ratelimiter, "time", types.SimpleNamespace(monotonic=clock.monotonic, time=clock.time, sleep=clock.sleep))
+    return clock
+
+def test_burst_then_wait_for_a_token(clock):
+    bucket = TokenBucket(calls=2, period=10, burst=3)
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.remaining() == 0
+    assert bucket.try_acquire() == pytest.approx(5)
+    assert bucket.next_slot_at() == pytest.approx(clock.now + 5)
+
+def test_tokens_refill_up_to_the_burst(clock):
+    bucket = TokenBucket(calls=1, period=1, burst=2)
+    bucket.try_acquire()
+    bucket.try_acquire()
+    clock.now += 100
+    assert bucket.remaining() == 2
+
+def test_acquire_sleeps_until_the_next_slot(clock):
+    bucket = TokenBucket(calls=1, period=60)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(60)
+    assert sum(clock.slept) == pytest.approx(60)
+
+def test_aacquire_waits_without_blocking(clock, monkeypatch):
+    waits = list()
+
+    async def sleep(seconds):
+        waits.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(ratelimiter.asyncio, "sleep", sleep)
+    bucket = TokenBucket(calls=1, period=30)
+    asyncio.run(bucket.aacquire())
+    assert asyncio.run(bucket.aacquire()) == pytest.approx(30)
+    assert waits and not clock.slept
+
+def test_every_request_takes_a_token_of_the_shared_bucket(session, monkeypatch):
+    bucket = TokenBucket(calls=100, period=3600, burst=100)
+    monkeypatch.setattr(transport, "limiter", bucket)
+    transport.get("https://rateyourmusic.com/artist/the-fall")
+    transport.get("https://rateyourmusic.com/genre/alternative-rock/")
+    assert bucket.remaining() == 98
@@ -0,0 +1,51 @@
+import random
+import pytest
+from rympy.ratings import Rating, RatingIndex
+
+# how a rating was looked up before the index: the first stored one equal to it
+def scan(ratings, rating):
+    return next((position for position, stored in enumerate(ratings) if stored == rating), None)
+
+def rating(id=None, url=None):
+    return Rating(id=id, url=url, title=f"{id} {url}")
+
+RATINGS = [rating("1", "/release/a/"), rating("2"), rating("3", "/release/c/"), rating("2", "/release/b/"),
+           rating("4", "/release/c/"), rating(None, "/release/d/"), rating("5", "")]
+
+@pytest.fixture
+def index():
+    return RatingIndex(RATINGS)
+
+@pytest.mark.parametrize("probe", [rating("1"), rating("2"), rating("5"), rating("9", "/release/c/"),
+                                   rating("4", "/release/a/"), rating(None, "/release/d/"), rating("9"),
+                                   rating("9", "/release/z/"), rating("9", ""), rating(None)])
+def test_find_matches_a_scan(index, probe):
+    assert index.find(probe) == scan(RATINGS, probe)
+    assert (probe in index) == (scan(RATINGS, probe) is not None)
+
+def test_first_and_last_positions(index):
+    assert index.index(RATINGS[0]) == 0
+    assert index.index(RATINGS[-1]) == len(RATINGS) - 1
+    with pytest.raises(ValueError):
+        index.index(rating("9"))
+
+def test_replaced_rating_is_reindexed(index):
+    ratings = list(RATINGS)
+    for position, new in [(1, rating("7")), (-1, rating("2", "/release/c/")), (0, rating("3"))]:
+        index[position] = new
+        ratings[position] = new
+    assert list(index) == ratings
+    for probe in [rating("1"), rating("2"), rating("3"), rating("7"), rating("9", "/release/a/"), rating("9", "/release/c/")]:
+        assert index.find(probe) == scan(ratings, probe)
+
+def test_random_ratings_match_a_scan():
+    generator = random.Random(11)
+    ratings = [rating(str(generator.randrange(50)), generator.choice(["", None, f"/release/{generator.randrange(50)}/"]))
+               for _ in range(300)]
+    index = RatingIndex(ratings)
+    for _ in range(100):
+        position = generator.randrange(len(ratings))
+        ratings[position] = index[position] = rating(str(generator.randrange(60)))
+    for number in range(60):
+        for probe in (rating(str(number)), rating("none", f"/release/{number}/")):
+            assert index.find(probe) == scan(ratings, probe)
@@ -0,0 +1,28 @@
+import builtins
+from rympy.ratings import iter_ratings
+
+HEADER = ("RYM Album, First Name,Last Name,First Name localized, Last Name localized,Title,Release_Date,"
+          "Rating,Ownership,Purchase Date,Media Type, Review\n")
+
+def write_export(tmp_path):
+    path = tmp_path / "ratings.csv"
+    path.write_text(HEADER + '1,,Radiohead,,,OK Computer,1997,10,n,,,"Two\nlines"\n'
+                    + "2,Mark E,Smith,,,Hex,1982,,n,,,\n", encoding="utf-8")
+    return str(path)
+
+def test_file_is_opened_only_while_iterating(tmp_path, monkeypatch):
+    opened = list()
+    open_file = builtins.open
+
+    def recording_open(*args, **kwargs):
+        opened.append(file := open_file(*args, **kwargs))
+        return file
+
+    monkeypatch.setattr(builtins, "open", recording_open)
+    ratings = iter_ratings(filename=write_export(tmp_path))
+    assert not opened
+    first = next(ratings)
+    assert first.title == "OK Computer" and first.rating == 5 and first.review == "Two\nlines"
+    assert not opened[0].closed
+    assert [rating.rating for rating in ratings] == [None]
+    assert opened[0].closed
@@ -0,0 +1,65 @@
+import random
+import statistics
+import pytest
+from rympy import ratings as ratings_module
+from rympy.ratings import Rating, RatingsTable
+
+@pytest.fixture(params=["numpy", "fallback"])
+def backend(request, monkeypatch):
+    if request.param == "numpy" and ratings_module.np is None:
+        pytest.skip("numpy is not installed")
+    if request.param == "fallback":
+        monkeypatch.setattr(ratings_module, "np", None)
+    return request.param
+
+def make_ratings(count, seed=5):
+    generator = random.Random(seed)
+    return [Rating(id=str(generator.randrange(count * 2)), first_name=generator.choice(["Mark E", "Brix", ""]),
+                   last_name=generator.choice(["Smith", "Radiohead", "The Fall"]),
+                   rating=generator.choice([None] + [half_stars / 2 for half_stars in range(1, 11)]),
+                   release_year=generator.choice([None, 1976, 1982, 1997, 2019]),
+                   ownership=generator.choice(["n", "o", "w"]))
+            for _ in range(count)]
+
+def test_statistics_match_a_list_of_ratings(backend):
+    ratings = make_ratings(500)
+    table = RatingsTable.from_ratings(ratings)
+    rated = [rating.rating for rating in ratings if rating.rating is not None]
+    assert len(table) == len(ratings)
+    assert table.mean() == pytest.approx(statistics.fmean(rated))
+    assert table.median() == pytest.approx(statistics.median(rated))
+    assert table.histogram() == {half_stars / 2: sum(rating == half_stars / 2 for rating in rated) for half_stars in range(1, 11)}
+
+    years = [rating.release_year for rating in ratings if rating.release_year]
+    assert table.ratings_per_year() == {year: years.count(year) for year in sorted(set(years))}
+    assert list(table.ratings_per_year()) == sorted(set(years))
+
+    by_artist = dict()
+    for rating in ratings:
+        if rating.rating is not None:
+            by_artist.setdefault(rating.artist_name, list()).append(rating.rating)
+    assert table.artist_averages() == pytest.approx({artist: statistics.fmean(values) for artist, values in by_artist.items()})
+
+def test_rows_read_back_as_stored(backend):
+    ratings = make_ratings(50)
+    rows = list(RatingsTable.from_ratings(ratings))
+    assert rows == [(rating.id, rating.rating, rating.release_year, rating.ownership, rating.artist_name) for rating in ratings]
+
+def test_empty_table(backend):
+    table = RatingsTable()
+    assert len(table) == 0
+    assert table.mean() is None and table.median() is None
+    assert table.histogram() == {half_stars / 2: 0 for half_stars in range(1, 11)}
+    assert table.ratings_per_year() == {} and table.artist_averages() == {}
+    assert list(table) == []
+
+def test_unrated_table(backend):
+    table = RatingsTable.from_ratings([Rating(id="1", rating=None, last_name="Smith")])
+    assert table.mean() is None and table.median() is None and table.artist_averages() == {}
+
+def test_strings_are_stored_once_across_tables():
+    first = RatingsTable.from_ratings([Rating(id="1", first_name="Mark E", last_name="Smith", ownership="n")])
+    second = RatingsTable.from_ratings([Rating(id="2", first_name="Mark E", last_name="Smith", ownership="n")])
+    assert first._artists[0] == second._artists[0]
+    assert next(iter(first))[4] is next(iter(second))[4]
+    assert next(iter(first))[3] is next(iter(second))[3]
@@ -0,0 +1,64 @@
+from rympy import *
+from rympy import transport
+
+LABEL_URL = "https://rateyourmusic.com/label/parlophone/"
+CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/1/"
+
+def page(session, url):
+    return session.pages[transport.canonical_url(url)][2]
+
+def test_unchanged_page_is_not_parsed_again(session):
+    label = Label(LABEL_URL)
+    name = label.name
+    assert label.refresh() == []
+    assert label.name is name
+    assert session.count(LABEL_URL) == 2
+
+def test_not_modified_answer_keeps_the_entity(session):
+    session.add(LABEL_URL, page(session, LABEL_URL), headers={"ETag": '"v1"'})
+    label = Label(LABEL_URL)
+    label.name
+    session.requests.clear()
+    assert label.refresh() == []
+    assert session.requests == [LABEL_URL]
+    assert label._etag == '"v1"'
+
+def test_changed_fields_are_reported(session):
+    label = Label(LABEL_URL)
+    label.name
+    label.number_of_releases
+    session.add(LABEL_URL, page(session, LABEL_URL).replace(b"Parlophone", b"Parlophone Records"))
+    assert label.refresh() == ["name"]
+    assert label.name == "Parlophone Records"
+
+def test_refresh_bypasses_the_response_cache(session, tmp_path):
+    transport.enable_cache(str(tmp_path / "cache.sqlite3"))
+    label = Label(LABEL_URL)
+    session.add(LABEL_URL, page(session, LABEL_URL).replace(b"Parlophone", b"Parlophone Records"))
+    assert "name" not in vars(label)
+    assert label.refresh() == []
+    assert label.name == "Parlophone Records"
+    assert Label(LABEL_URL).name == "Parlophone Records"
+    assert session.count(LABEL_URL) == 2
+
+def test_changed_collection_resets_to_its_first_page(session):
+    chart = Chart.from_url(CHART_URL)
+    first_entries = [entry.title for entry in chart.entries[0]]
+    session.add(CHART_URL, page(session, CHART_URL).replace(b"Golden Night", b"Golden Morning"))
+    assert chart.refresh() == ["entries"]
+    assert [entry.title for entry in chart.entries[0]] != first_entries and len(chart.entries) == 1
+    assert chart.refresh() == []
+
+def list_page(author, list_id):
+    return (f'<html><body><a class="user">{author}</a><input class="list_shortcut" value="[list{list_id}]">'
+            f'<a class="navlinknum">1</a><a class="navlinknum">2</a><a class="navlinknext">next</a></body></html>').encode()
+
+def test_collection_fields_are_read_again_from_the_new_first_page(session):
+    url = "https://rateyourmusic.com/list/listmaker/best-of/1/"
+    session.add(url, list_page("listmaker", 123))
+    rym_list = RYMList(url)
+    assert rym_list.author.username == "listmaker" and rym_list._id == "123"
+    session.add(url, list_page("someone_else", 456))
+    assert rym_list.refresh() == ["author"]
+    assert rym_list.author.username == "someone_else"
+    assert rym_list._id == "456"
@@ -0,0 +1,71 @@
+import pytest
+from rympy import *
+from rympy import serialization
+from rympy import transport
+from rympy.base_classes import _field_state
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+ARTIST_URL = "https://rateyourmusic.com/artist/the-fall"
+LABEL_URL = "https://rateyourmusic.com/label/parlophone/"
+CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/1/"
+
+def public_state(entity):
+    return {name: _field_state(getattr(entity, name)) for name in entity._lazy_fields() if not name.startswith("_")}
+
+@pytest.fixture(params=["json", "msgpack"])
+def codec(request, monkeypatch):
+    if request.param == "msgpack" and serialization.msgpack is None:
+        pytest.skip("msgpack is not installed")
+    if request.param == "json":
+        monkeypatch.setattr(serialization, "msgpack", None)
+    return request.param
+
+@pytest.mark.parametrize("url", [RELEASE_URL, ARTIST_URL, LABEL_URL])
+def test_round_trip_keeps_every_field(session, codec, url):
+    entity = get_entity(url)
+    loaded = loads(dumps(entity))
+    assert type(loaded) is type(entity)
+    assert loaded.url == entity.url
+    assert public_state(loaded) == public_state(entity)
+
+def test_round_trip_keeps_shared_objects_shared(session):
+    release = from_dict(to_dict(get_entity(RELEASE_URL)))
+    tracks = {id(track) for track in release.tracklist}
+    linked = [track for credit in release.credited_artists for role in credit.roles for track in role.tracks or ()]
+    assert linked and all(id(track) in tracks for track in linked)
+    assert release.get_track_by_number(linked[0].number) is release.tracklist[release._track_positions[linked[0].number]]
+
+def test_loaded_label_finds_its_chart(session):
+    chart_url = "https://rateyourmusic.com/charts/top/album/all-time/l:parlophone/1/"
+    session.add(chart_url, session.pages[transport.canonical_url(CHART_URL)][2])
+    label = loads(dumps(get_entity(LABEL_URL)))
+    assert label._soup is None
+    assert transport.canonical_url(label.chart.init_url) == transport.canonical_url(chart_url)
+
+def test_load_into_an_existing_object(session):
+    release = get_entity(RELEASE_URL)
+    target = Release.__new__(Release)
+    assert from_dict(to_dict(release), into=target) is target
+    assert target.title == release.title
+    with pytest.raises(TypeError):
+        from_dict(to_dict(release), into=Label.__new__(Label))
+
+@pytest.mark.parametrize("write, read", [("json", "msgpack"), ("msgpack", "json")])
+def test_data_reads_back_with_either_install(session, monkeypatch, write, read):
+    if serialization.msgpack is None:
+        pytest.skip("msgpack is not installed")
+    msgpack = serialization.msgpack
+    label = get_entity(LABEL_URL)
+    monkeypatch.setattr(serialization, "msgpack", msgpack if write == "msgpack" else None)
+    data = dumps(label)
+    monkeypatch.setattr(serialization, "msgpack", msgpack if read == "msgpack" else None)
+    if write == "msgpack" and read == "json":
+        with pytest.raises(ImportError):
+            loads(data)
+    else:
+        assert loads(data).name == "Parlophone"
+
+def test_untagged_data_still_loads(session):
+    label = get_entity(LABEL_URL)
+    assert loads(dumps(label)[1:]).name == "Parlophone"
+    assert loads(serialization.json.dumps(to_dict(label)).encode("utf-8")).name == "Parlophone"
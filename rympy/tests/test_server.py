@@ -0,0 +1,42 @@
+import pytest
+from rympy import *
+from rympy import transport
+from rympy.benchmarks import StandInServer
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+CHART_URL = "https://rateyourmusic.com/charts/top/album/all-time/1/"
+
+@pytest.fixture
+def http_session(session, monkeypatch):
+    # a real requests session, so that the pages come over HTTP from the stand-in server
+    monkeypatch.setattr(transport, "_session", transport.create_session())
+    return session
+
+def test_entity_is_fetched_from_the_stand_in_server(http_session):
+    with StandInServer() as server:
+        assert transport._request_url(RELEASE_URL) == server.url + "/release/album/radiohead/ok-computer/"
+        release = Release(RELEASE_URL)
+        assert server.stats["requests"] == 1
+    assert release.url == RELEASE_URL
+    assert release.title == "OK Computer"
+    assert not http_session.requests
+    assert transport._root_url is None and transport._request_url(RELEASE_URL) == RELEASE_URL
+
+def test_collection_pages_past_the_saved_one(http_session):
+    with StandInServer(pages=3) as server:
+        chart = Chart.from_url(CHART_URL)
+        chart.load_more_entries()
+        chart.load_more_entries()
+        assert server.stats["requests"] == 3
+        assert len(chart.entries) == 3
+        with pytest.raises(RequestFailed):
+            chart.load_more_entries()
+        assert server.stats["not_found"] == 1
+
+def test_cache_is_bypassed_while_the_server_runs(http_session, tmp_path):
+    cache = transport.enable_cache(str(tmp_path / "cache.sqlite3"))
+    with StandInServer() as server:
+        transport.get(RELEASE_URL, kind="release")
+        transport.get(RELEASE_URL, kind="release")
+        assert server.stats["requests"] == 2
+    assert len(cache) == 0
@@ -0,0 +1,53 @@
+import pytest
+from rympy import *
+from rympy.ratings import Rating
+from rympy.store import SQLiteStore, enable_store
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+ARTIST_URL = "https://rateyourmusic.com/artist/the-fall"
+LABEL_URL = "https://rateyourmusic.com/label/parlophone/"
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStore(str(tmp_path / "store.sqlite3"))
+    yield store
+    store.close()
+
+def test_saved_release_is_found_by_url_and_id(session, store):
+    release = store.save(get_entity(RELEASE_URL))
+    by_url = store.get(RELEASE_URL)
+    assert by_url is not release
+    assert (by_url.title, by_url.tracklist[0].title) == (release.title, release.tracklist[0].title)
+    assert store.get_release(release.id).url == release.url
+    assert store.get("https://rateyourmusic.com/release/album/nobody/nothing/") is None
+
+def test_find_releases_by_label_artist_genre_and_rating(session, store):
+    release = store.save(get_entity(RELEASE_URL))
+    artist_url = release.artists[0].url
+    assert [found.title for found in store.find_releases(label_url=LABEL_URL)] == ["OK Computer"]
+    assert [found.title for found in store.find_releases(artist_url=artist_url, genre="Art Rock")] == ["OK Computer"]
+    assert store.find_releases(min_rating=release.average_rating + 0.01) == []
+    assert store.find_releases(genre="Krautrock") == []
+
+def test_ratings_are_upserted(store):
+    store.save_ratings("listmaker", [Rating(id="1", title="OK Computer", rating=4.5)])
+    store.save_ratings("listmaker", [Rating(id="1", title="OK Computer", rating=5), Rating(id="2", title="Hex", rating=4)])
+    assert {(rating.id, rating.rating) for rating in store.get_ratings("listmaker")} == {("1", 5), ("2", 4)}
+
+def test_failed_transaction_is_rolled_back(session, store):
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.save(get_entity(ARTIST_URL))
+            raise RuntimeError
+    assert store.get(ARTIST_URL) is None
+
+def test_stored_entity_is_loaded_without_a_request(session, tmp_path):
+    store = enable_store(str(tmp_path / "store.sqlite3"))
+    try:
+        store.save(Label(LABEL_URL))
+        assert session.count(LABEL_URL) == 1
+        label = Label(LABEL_URL)
+        assert label.name == "Parlophone"
+        assert session.count(LABEL_URL) == 1
+    finally:
+        store.close()
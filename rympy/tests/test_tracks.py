@@ -0,0 +1,55 @@
+import pytest
+from rympy import *
+
+RELEASE_URL = "https://rateyourmusic.com/release/album/radiohead/ok-computer/"
+NUMBERS = ["A1", "A2", "A3", "B1", "B2", "B2", "C1"]
+TITLES = ["Side A", "Intro", "Side A", "Turn", "Reprise", "Reprise (alt)", "Outro"]
+
+# how tracks were looked up before the tracklist was indexed
+def scan_by_title(tracklist, title):
+    for track in tracklist:
+        if track.title == title:
+            return track
+
+def scan_by_number(tracklist, number):
+    for track in tracklist:
+        if track.number == number:
+            return track
+
+def scan_range(tracklist, start, stop):
+    tracks, started = list(), False
+    for track in tracklist:
+        if track.number == stop:
+            break
+        if track.number == start:
+            started = True
+        if started:
+            tracks.append(track)
+    return tracks
+
+@pytest.fixture
+def release():
+    release = Release.__new__(Release)
+    release.tracklist = [Track(number=number, title=title, length=None) for number, title in zip(NUMBERS, TITLES)]
+    return release
+
+@pytest.mark.parametrize("number", NUMBERS + ["D1", "1", ""])
+def test_track_by_number_matches_a_scan(release, number):
+    assert release.get_track_by_number(number) is scan_by_number(release.tracklist, number)
+
+@pytest.mark.parametrize("title", TITLES + ["Missing"])
+def test_track_by_title_matches_a_scan(release, title):
+    assert release.get_track_by_title(title) is scan_by_title(release.tracklist, title)
+
+@pytest.mark.parametrize("start, stop", [("A1", "B1"), ("A2", "A3"), ("A1", "A1"), ("B1", "C1"), ("B2", "C1"),
+                                         ("A3", "D1"), ("C1", "D1"), ("B1", "A2"), ("D1", "A2"), ("A1", "B2")])
+def test_track_range_matches_a_scan(release, start, stop):
+    assert list(map(id, release.get_tracks_in_range(start, stop))) == list(map(id, scan_range(release.tracklist, start, stop)))
+
+def test_parsed_tracklist_is_indexed(session):
+    release = get_entity(RELEASE_URL)
+    for track in release.tracklist:
+        assert release.get_track_by_number(track.number) is scan_by_number(release.tracklist, track.number)
+        assert release.get_track_by_title(track.title) is scan_by_title(release.tracklist, track.title)
+    first, last = release.tracklist[0].number, release.tracklist[-1].number
+    assert list(map(id, release.get_tracks_in_range(first, last))) == list(map(id, release.tracklist[:-1]))